@@ -1,10 +1,20 @@
 # app.py
 import sys
+import argparse
 from PyQt6.QtWidgets import QApplication
 from ui.main_window import ModbusGUI
+from modules.backend_module import BACKENDS
 
 if __name__ == "__main__":
-    app = QApplication(sys.argv)
-    window = ModbusGUI()
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--backend", default="native", choices=list(BACKENDS))
+    parser.add_argument("--framing", default="mbap", choices=["mbap", "rtu"])
+    parser.add_argument("--transport", default="tcp", choices=["tcp", "pty"])
+    parser.add_argument("--units", type=int, default=1, choices=range(1, 248), metavar="1..247",
+                        help="number of slave units behind the gateway")
+    args, qt_args = parser.parse_known_args()
+
+    app = QApplication(sys.argv[:1] + qt_args)
+    window = ModbusGUI(backend=args.backend, framing=args.framing, transport=args.transport, units=args.units)
     window.show()
     sys.exit(app.exec())
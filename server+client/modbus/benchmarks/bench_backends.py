@@ -0,0 +1,190 @@
+# benchmarks/bench_backends.py
+"""
+Сравнение backend'ов (native / pymodbus) на одинаковом сценарии.
+
+Сервер запускается в отдельном процессе, чтобы его CPU и RSS измерялись
+отдельно от клиентов. Для каждого backend'а:
+  - throughput        — ответов в секунду у всех клиентов
+  - latency p50/p99   — задержка ответа, мс
+  - server/client CPU — мс процессорного времени на 1000 запросов
+  - memory/conn       — прирост RSS сервера на одно простаивающее соединение
+
+Запуск из каталога server+client/modbus:
+    python -m benchmarks.bench_backends --clients 10 --pps 500 --window 8 --duration 10
+"""
+import os
+import sys
+import json
+import time
+import socket
+import argparse
+import multiprocessing
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+from modules.backend_module import BACKENDS, get_backend
+
+
+def _server_process(backend_name, port, framing, ready, stop):
+    sys.stdout = open(os.devnull, "w")
+    server = get_backend(backend_name).create_server(port=port, framing=framing)
+    server.start()
+    ready.set()
+    stop.wait()
+    server.stop()
+
+
+def _wait_listening(port, timeout=10.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.5).close()
+            return True
+        except OSError:
+            time.sleep(0.05)
+    return False
+
+
+def _percentile(values, q):
+    if not values:
+        return None
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+def _server_cpu(proc):
+    if proc is None:
+        return None
+    times = proc.cpu_times()
+    return times.user + times.system
+
+
+def run_backend(backend_name, clients=10, pps=500, window=8, duration=10.0,
+                idle_connections=200, port=15300, warmup=1.0, framing="mbap"):
+    ready = multiprocessing.Event()
+    stop = multiprocessing.Event()
+    server = multiprocessing.Process(target=_server_process, args=(backend_name, port, framing, ready, stop), daemon=True)
+    server.start()
+    try:
+        ready.wait(10)
+        if not _wait_listening(port):
+            raise RuntimeError(f"{backend_name} server did not start on port {port}")
+        server_proc = psutil.Process(server.pid) if psutil else None
+
+        # Память на соединение: простаивающие TCP-соединения к серверу
+        memory_per_connection = None
+        if server_proc is not None and idle_connections:
+            time.sleep(0.3)
+            rss_before = server_proc.memory_info().rss
+            idle = [socket.create_connection(("127.0.0.1", port)) for _ in range(idle_connections)]
+            time.sleep(1.0)
+            memory_per_connection = (server_proc.memory_info().rss - rss_before) / idle_connections
+            for sock in idle:
+                sock.close()
+            time.sleep(0.3)
+
+        backend = get_backend(backend_name)
+        workers = [
+            backend.create_client(port=port, packets_per_second=pps, pipeline_window=window, framing=framing)
+            for _ in range(clients)
+        ]
+        for worker in workers:
+            worker.start()
+        time.sleep(warmup)
+
+        for worker in workers:
+            worker.drain_latencies()
+        received_before = sum(w.received_packets for w in workers)
+        server_cpu_before = _server_cpu(server_proc)
+        client_cpu_before = time.process_time()
+        started = time.time()
+
+        time.sleep(duration)
+
+        elapsed = time.time() - started
+        received = sum(w.received_packets for w in workers) - received_before
+        server_cpu = _server_cpu(server_proc)
+        client_cpu = time.process_time() - client_cpu_before
+        latencies = [lat for w in workers for lat in w.drain_latencies()]
+        errors = sum(w.errors for w in workers)
+        timeouts = sum(w.timeouts for w in workers)
+
+        for worker in workers:
+            worker.stop()
+    finally:
+        stop.set()
+        server.join(5)
+        if server.is_alive():
+            server.terminate()
+
+    per_1k = received / 1000.0 if received else None
+    p50 = _percentile(latencies, 0.50)
+    p99 = _percentile(latencies, 0.99)
+    return {
+        "backend": backend_name,
+        "framing": framing,
+        "throughput": received / elapsed,
+        "latency_p50_ms": p50 * 1000 if p50 is not None else None,
+        "latency_p99_ms": p99 * 1000 if p99 is not None else None,
+        "server_cpu_ms_per_1k": (server_cpu - server_cpu_before) * 1000 / per_1k
+        if per_1k and server_cpu is not None else None,
+        "client_cpu_ms_per_1k": client_cpu * 1000 / per_1k if per_1k else None,
+        "memory_per_connection_bytes": memory_per_connection,
+        "errors": errors,
+        "timeouts": timeouts
+    }
+
+
+def _fmt(value, digits=2):
+    if value is None:
+        return "n/a"
+    return f"{value:.{digits}f}"
+
+
+def print_table(results):
+    header = f"{'backend':<10} {'resp/s':>10} {'p50 ms':>8} {'p99 ms':>8} " \
+             f"{'srv cpu/1k':>11} {'cli cpu/1k':>11} {'mem/conn':>10} {'err':>6} {'t/o':>6}"
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        print(f"{r['backend']:<10} {_fmt(r['throughput'], 0):>10} {_fmt(r['latency_p50_ms'], 3):>8} "
+              f"{_fmt(r['latency_p99_ms'], 3):>8} {_fmt(r['server_cpu_ms_per_1k']):>11} "
+              f"{_fmt(r['client_cpu_ms_per_1k']):>11} {_fmt(r['memory_per_connection_bytes'], 0):>10} "
+              f"{r['errors']:>6} {r['timeouts']:>6}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Modbus backend head-to-head benchmark")
+    parser.add_argument("--backends", default=",".join(BACKENDS))
+    parser.add_argument("--clients", type=int, default=10)
+    parser.add_argument("--pps", type=int, default=500, help="requests per second per client")
+    parser.add_argument("--window", type=int, default=8, help="pipeline window (0 - off)")
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--framing", default="mbap", choices=["mbap", "rtu"])
+    parser.add_argument("--idle-connections", type=int, default=200)
+    parser.add_argument("--port", type=int, default=15300)
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args()
+
+    if psutil is None:
+        print("psutil is not installed: server CPU and memory will be n/a")
+
+    results = []
+    for offset, name in enumerate(args.backends.split(",")):
+        results.append(run_backend(
+            name.strip(), clients=args.clients, pps=args.pps, window=args.window or None,
+            duration=args.duration, idle_connections=args.idle_connections, port=args.port + offset,
+            framing=args.framing
+        ))
+
+    print_table(results)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
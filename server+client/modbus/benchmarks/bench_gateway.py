@@ -0,0 +1,86 @@
+# benchmarks/bench_gateway.py
+"""
+Шлюз с множеством юнитов: память на простаивающий юнит и стоимость
+маршрутизации запроса по unit id при росте числа юнитов (1 .. 10k).
+
+Запуск из каталога server+client/modbus:
+    python -m benchmarks.bench_gateway --units 1,100,1000,10000
+"""
+import json
+import time
+import random
+import struct
+import argparse
+import tracemalloc
+
+from modules.datastore_module import GatewayDataStore, UnitTemplate, HOLDING_REGISTERS
+from modules.server_module import ModbusTCPServer
+
+
+def _template():
+    template = UnitTemplate("plc")
+    template.set_values(HOLDING_REGISTERS, 0, list(range(256)))
+    template.set_values(HOLDING_REGISTERS, 40000, [1] * 64)
+    return template
+
+
+def memory_per_unit(units):
+    template = _template()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    store = GatewayDataStore(default_template=template)
+    store.add_units(range(1, units + 1))
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (after - before) / units
+
+
+def lookup_cost(units, requests=200000):
+    """Среднее время (нс) на get_unit и на полный разбор запроса FC3"""
+    store = GatewayDataStore(default_template=_template())
+    store.add_units(range(1, units + 1))
+    server = ModbusTCPServer(datastore=store)
+
+    addresses = [random.randint(1, units) for _ in range(requests)]
+    started = time.perf_counter()
+    for unit_address in addresses:
+        store.get_unit(unit_address)
+    lookup_ns = (time.perf_counter() - started) * 1e9 / requests
+
+    # unit_base переводит однобайтовый unit id в адрес юнита шлюза
+    pdus = [(a, struct.pack(">BHH", 3, random.randint(0, 250), 4)) for a in addresses]
+    started = time.perf_counter()
+    for unit_address, pdu in pdus:
+        server.unit_base = unit_address - 1
+        server._process_pdu(1, pdu)
+    request_ns = (time.perf_counter() - started) * 1e9 / requests
+    return lookup_ns, request_ns
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Multi-unit gateway datastore benchmark")
+    parser.add_argument("--units", default="1,100,1000,10000")
+    parser.add_argument("--requests", type=int, default=200000)
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args()
+
+    results = []
+    print(f"{'units':>8} {'bytes/unit':>11} {'lookup ns':>10} {'FC3 ns':>10}")
+    for units in [int(u) for u in args.units.split(",")]:
+        per_unit = memory_per_unit(units)
+        lookup_ns, request_ns = lookup_cost(units, args.requests)
+        results.append({
+            "units": units,
+            "bytes_per_idle_unit": per_unit,
+            "lookup_ns": lookup_ns,
+            "fc3_request_ns": request_ns
+        })
+        print(f"{units:>8} {per_unit:>11.0f} {lookup_ns:>10.0f} {request_ns:>10.0f}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+# benchmarks/bench_rtu.py
+"""
+Скорость RTU-движка: CRC16 (одиночный буфер и пакетная проверка кадров)
+и выделение кадров из потока (RTUDeframer), в байтах в секунду.
+
+Запуск из каталога server+client/modbus:
+    python -m benchmarks.bench_rtu --megabytes 4
+"""
+import os
+import json
+import time
+import random
+import struct
+import argparse
+
+from modules.rtu_module import RTUDeframer, build_rtu_frame, crc16, validate_frames
+
+
+def _request_frames(count):
+    """Смесь типичных запросов: чтение регистров и запись нескольких регистров"""
+    frames = []
+    for _ in range(count):
+        if random.random() < 0.8:
+            pdu = struct.pack(">BHH", 3, random.randint(0, 1000), random.randint(1, 125))
+        else:
+            registers = random.randint(1, 60)
+            pdu = struct.pack(">BHHB", 16, random.randint(0, 1000), registers, registers * 2) \
+                + os.urandom(registers * 2)
+        frames.append(build_rtu_frame(random.randint(1, 247), pdu))
+    return frames
+
+
+def _rate(func, size, repeat=3):
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return size / best
+
+
+def run(megabytes=4.0, chunk=4096):
+    data = os.urandom(int(megabytes * 1024 * 1024))
+
+    frames = []
+    stream_size = 0
+    while stream_size < len(data):
+        batch = _request_frames(1000)
+        frames.extend(batch)
+        stream_size += sum(len(f) for f in batch)
+    stream = b"".join(frames)
+
+    def deframe():
+        deframer = RTUDeframer(request=True)
+        found = 0
+        for offset in range(0, len(stream), chunk):
+            found += len(deframer.feed(stream[offset:offset + chunk]))
+        assert found == len(frames), (found, len(frames))
+
+    results = {
+        "crc16_bytes_per_sec": _rate(lambda: crc16(data), len(data)),
+        "validate_frames_bytes_per_sec": _rate(lambda: validate_frames(frames), len(stream)),
+        "validate_frames_per_sec": _rate(lambda: validate_frames(frames), len(frames)),
+        "deframe_bytes_per_sec": _rate(deframe, len(stream)),
+        "deframe_frames_per_sec": _rate(deframe, len(frames)),
+    }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="RTU CRC16 / deframing benchmark")
+    parser.add_argument("--megabytes", type=float, default=4.0)
+    parser.add_argument("--chunk", type=int, default=4096, help="bytes per feed() call")
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args()
+
+    results = run(args.megabytes, args.chunk)
+    for name, value in results.items():
+        unit = "MB/s" if name.endswith("bytes_per_sec") else "frames/s"
+        scaled = value / 1e6 if unit == "MB/s" else value
+        print(f"{name:<32} {scaled:>14,.2f} {unit}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
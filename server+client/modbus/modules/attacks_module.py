@@ -3,93 +3,210 @@ import time
 import threading
 import random
 
+from modules.scheduler import TimerWheel
+from modules.campaign_module import load_campaign
+from modules.impact_module import ImpactMonitor
+
 
 class AttackManager:
-    def __init__(self, server, proxy_manager, client_manager):
+    # attack_type: (период шага в секундах, метод шага)
+    ATTACK_STEPS = {
+        "SYN Flood": (0.3, "_attack_syn_flood"),
+        "Function Spam": (0.2, "_attack_function_spam"),
+        "Random Packets": (0.2, "_attack_random_packets"),
+        "Slowloris": (1.0, "_attack_slowloris"),
+    }
+
+    def __init__(self, server, proxy_manager, client_manager, scheduler=None):
         """
         Обновлённый конструктор AttackManager(self.server, self.proxy_manager, self.client_manager)
+        Все атаки и сценарии обслуживаются одним планировщиком (TimerWheel).
         """
         self.server = server
         self.proxy_manager = proxy_manager
         self.client_manager = client_manager
 
+        self.scheduler = scheduler or TimerWheel()
+        self.scheduler.start()
+        self.lock = threading.Lock()
+
         # Активные атаки:
         # attack_id: {
         #     "client_index": int,
         #     "attack_type": str,
         #     "started": float,
-        #     "thread": Thread,
+        #     "timer": Timer,            # периодический шаг атаки
+        #     "stop_timer": Timer|None,  # автоостановка по duration
+        #     "campaign_id": int|None,
         #     "running": bool
         # }
         self.active_attacks = {}
         self.attack_counter = 0
 
+        # Активные сценарии:
+        # campaign_id: {"name": str, "started": float, "timers": [Timer, ...], "finished": bool,
+        #               "touched": {client_index: churn_interval до сценария}}
+        # finished — все шаги отработали; запись удаляется, когда остановлены
+        # и все атаки, запущенные сценарием
+        self.active_campaigns = {}
+        self.campaign_counter = 0
+
+        # Отчёты о влиянии атак (baseline / during / recovery)
+        self.impact = ImpactMonitor(server, client_manager, self.scheduler, self._attacked_clients)
+
     # -----------------------------------------------------
     # PUBLIC API — вызывается из GUI
     # -----------------------------------------------------
 
-    def start_attack_for_client(self, client_index: int, attack_type: str):
-        """Запуск атаки на выбранного клиента"""
-        if client_index >= len(self.client_manager.clients):
-            print("[AttackManager] Invalid client index")
-            return False
-
-        attack_id = self.attack_counter
-        self.attack_counter += 1
-
-        entry = {
-            "client_index": client_index,
-            "attack_type": attack_type,
-            "started": time.time(),
-            "running": True,
-            "thread": None
-        }
-
-        thread = threading.Thread(target=self._run_attack, args=(attack_id,), daemon=True)
-        entry["thread"] = thread
-        self.active_attacks[attack_id] = entry
-
-        thread.start()
-        return True
+    def start_attack_for_client(self, client_index: int, attack_type: str, duration=None):
+        """Запуск атаки на выбранного клиента (duration — автоостановка через N секунд)"""
+        return self._start_attack(client_index, attack_type, duration) is not None
 
     def stop_attack(self, attack_id: int):
-        """Остановка атаки: флаг + нормализация клиента"""
-        if attack_id not in self.active_attacks:
+        """Остановка атаки: отмена таймеров + нормализация клиента"""
+        with self.lock:
+            attack = self.active_attacks.pop(attack_id, None)
+        if attack is None:
             return False
 
-        attack = self.active_attacks[attack_id]
         attack["running"] = False
+        attack["timer"].cancel()
+        if attack["stop_timer"]:
+            attack["stop_timer"].cancel()
 
         client_idx = attack["client_index"]
-        client = self.client_manager.clients[client_idx]
+        if client_idx < len(self.client_manager.clients):
+            client = self.client_manager.clients[client_idx]
+
+            # --- ВОССТАНАВЛИВАЕМ КЛИЕНТА ---
+            client.update_rate(client.default_rate if hasattr(client, "default_rate") else 1)
 
-        # --- ВОССТАНАВЛИВАЕМ КЛИЕНТА ---
-        client.update_rate(client.default_rate if hasattr(client, "default_rate") else 1)
+        self.impact.attack_stopped(attack_id)
 
-        print(f"[AttackManager] Requested stop attack {attack_id}")
+        print(f"[Attack] Stop {attack['attack_type']} on client #{client_idx}")
+        if attack["campaign_id"] is not None:
+            self._release_campaign(attack["campaign_id"])
         return True
 
     def list_attacks(self):
         """Вернуть список всех активных атак для GUI"""
-        return [
-            {
-                "id": attack_id,
-                "client_index": info["client_index"],
-                "attack_type": info["attack_type"],
-                "running": info["running"],
-                "started": info["started"]
+        with self.lock:
+            return [
+                {
+                    "id": attack_id,
+                    "client_index": info["client_index"],
+                    "attack_type": info["attack_type"],
+                    "running": info["running"],
+                    "started": info["started"]
+                }
+                for attack_id, info in self.active_attacks.items()
+            ]
+
+    def get_report(self, attack_id: int):
+        """Отчёт о влиянии атаки (готов через recovery_seconds после остановки)"""
+        return self.impact.get_report(attack_id)
+
+    def list_reports(self):
+        return self.impact.list_reports()
+
+    # -----------------------------------------------------
+    # CAMPAIGNS — сценарии атак по времени
+    # -----------------------------------------------------
+
+    def run_campaign(self, campaign):
+        """
+        Запуск сценария. campaign — путь к JSON-файлу или уже разобранный
+        словарь (см. modules.campaign_module.load_campaign).
+        Возвращает campaign_id.
+        """
+        if isinstance(campaign, str):
+            campaign = load_campaign(campaign)
+
+        with self.lock:
+            campaign_id = self.campaign_counter
+            self.campaign_counter += 1
+            entry = {
+                "name": campaign["name"],
+                "started": time.time(),
+                "timers": [],
+                "finished": False,
+                "touched": {}
             }
-            for attack_id, info in self.active_attacks.items()
-        ]
+            self.active_campaigns[campaign_id] = entry
+
+        for step in campaign["steps"]:
+            entry["timers"].append(
+                self.scheduler.call_later(step["at"], self._run_campaign_step, campaign_id, step)
+            )
+
+        # Сценарий считается завершённым, когда отработал последний шаг (с учётом длительности)
+        finish_at = max(step["at"] + (step.get("duration") or step.get("over") or 0) for step in campaign["steps"])
+        entry["timers"].append(self.scheduler.call_later(finish_at, self._finish_campaign, campaign_id))
+
+        print(f"[Campaign] Start {campaign['name']} ({len(campaign['steps'])} steps)")
+        return campaign_id
+
+    def stop_campaign(self, campaign_id: int):
+        """Остановка сценария: отмена будущих шагов и атак, запущенных сценарием"""
+        with self.lock:
+            entry = self.active_campaigns.pop(campaign_id, None)
+            attack_ids = [
+                attack_id for attack_id, info in self.active_attacks.items()
+                if info["campaign_id"] == campaign_id
+            ]
+        if entry is None:
+            return False
+
+        for timer in entry["timers"]:
+            timer.cancel()
+        for attack_id in attack_ids:
+            self.stop_attack(attack_id)
+
+        # --- ВОССТАНАВЛИВАЕМ КЛИЕНТОВ после set_rate / ramp / set_churn ---
+        for client_idx in entry["touched"]:
+            if client_idx < len(self.client_manager.clients):
+                client = self.client_manager.clients[client_idx]
+                client.update_rate(client.default_rate if hasattr(client, "default_rate") else 1)
+                client.set_churn(entry["touched"][client_idx])
+
+        print(f"[Campaign] Stop {entry['name']}")
+        return True
+
+    def stop_all_campaigns(self):
+        """Остановка всех сценариев (шаги, ещё не наступившие, не выполнятся)"""
+        stopped = False
+        for campaign_id in list(self.active_campaigns.keys()):
+            stopped = self.stop_campaign(campaign_id) or stopped
+        return stopped
+
+    def list_campaigns(self):
+        with self.lock:
+            attacks = {}
+            for info in self.active_attacks.values():
+                if info["campaign_id"] is not None:
+                    attacks[info["campaign_id"]] = attacks.get(info["campaign_id"], 0) + 1
+            return [
+                {
+                    "id": campaign_id,
+                    "name": info["name"],
+                    "started": info["started"],
+                    "finished": info["finished"],
+                    "attacks": attacks.get(campaign_id, 0)
+                }
+                for campaign_id, info in self.active_campaigns.items()
+            ]
 
     # -----------------------------------------------------
     # INTERNAL — логика исполнения конкретной атаки
     # -----------------------------------------------------
 
-    def _run_attack(self, attack_id):
-        entry = self.active_attacks[attack_id]
-        attack_type = entry["attack_type"]
-        client_index = entry["client_index"]
+    def _start_attack(self, client_index, attack_type, duration=None, campaign_id=None):
+        if client_index >= len(self.client_manager.clients):
+            print("[AttackManager] Invalid client index")
+            return None
+        if attack_type not in self.ATTACK_STEPS:
+            print(f"[AttackManager] Unknown attack type: {attack_type}")
+            return None
 
         client = self.client_manager.clients[client_index]
 
@@ -97,50 +214,153 @@ class AttackManager:
         if not hasattr(client, "default_rate"):
             client.default_rate = client.packets_per_second
 
+        period, method = self.ATTACK_STEPS[attack_type]
+
+        with self.lock:
+            attack_id = self.attack_counter
+            self.attack_counter += 1
+
+            entry = {
+                "client_index": client_index,
+                "attack_type": attack_type,
+                "started": time.time(),
+                "running": True,
+                "timer": None,
+                "stop_timer": None,
+                "campaign_id": campaign_id
+            }
+            self.active_attacks[attack_id] = entry
+
+            entry["timer"] = self.scheduler.call_every(
+                period, self._run_attack_step, attack_id, getattr(self, method), client
+            )
+            if duration:
+                entry["stop_timer"] = self.scheduler.call_later(duration, self.stop_attack, attack_id)
+
+        self.impact.attack_started(attack_id, attack_type, client_index)
+
         print(f"[Attack] Start {attack_type} on client #{client_index}")
+        return attack_id
 
-        try:
-            if attack_type == "SYN Flood":
-                self._attack_syn_flood(attack_id, client)
-            elif attack_type == "Function Spam":
-                self._attack_function_spam(attack_id, client)
-            elif attack_type == "Random Packets":
-                self._attack_random_packets(attack_id, client)
-            elif attack_type == "Slowloris":
-                self._attack_slowloris(attack_id, client)
+    def _attacked_clients(self):
+        with self.lock:
+            return {info["client_index"] for info in self.active_attacks.values()}
 
+    def _run_attack_step(self, attack_id, step, client):
+        attack = self.active_attacks.get(attack_id)
+        if attack is None or not attack["running"]:
+            return
+        try:
+            step(attack_id, client)
         except Exception as e:
-            print(f"[Attack] ERROR in {attack_type}: {e}")
+            print(f"[Attack] ERROR in {attack['attack_type']}: {e}")
+            self.stop_attack(attack_id)
+
+    def _run_campaign_step(self, campaign_id, step):
+        if campaign_id not in self.active_campaigns:
+            return
+
+        action = step["action"]
+        if action == "stop_all":
+            # Только атаки этого сценария: ручные и чужие атаки не трогаем
+            with self.lock:
+                attack_ids = [
+                    attack_id for attack_id, info in self.active_attacks.items()
+                    if info["campaign_id"] == campaign_id
+                ]
+            for attack_id in attack_ids:
+                self.stop_attack(attack_id)
+            return
+
+        clients = [idx for idx in step["clients"] if idx < len(self.client_manager.clients)]
+        if len(clients) < len(step["clients"]):
+            print(f"[Campaign] Step at {step['at']}s: only {len(clients)} of {len(step['clients'])} clients exist")
+
+        if action in ("set_rate", "set_churn", "ramp"):
+            self._remember_clients(campaign_id, clients)
+
+        if action == "attack":
+            for idx in clients:
+                self._start_attack(idx, step["attack_type"], step["duration"], campaign_id)
+
+        elif action == "set_rate":
+            for idx in clients:
+                self.client_manager.set_client_rate(idx, step["pps"])
+
+        elif action == "set_churn":
+            for idx in clients:
+                self.client_manager.set_client_churn(idx, step["interval"])
+
+        elif action == "ramp":
+            self._start_ramp(campaign_id, clients, step)
+
+    def _remember_clients(self, campaign_id, clients):
+        """Запомнить исходные скорость и churn клиентов, чтобы stop_campaign их вернул"""
+        entry = self.active_campaigns.get(campaign_id)
+        if entry is None:
+            return
+        for idx in clients:
+            client = self.client_manager.clients[idx]
+            if not hasattr(client, "default_rate"):
+                client.default_rate = client.packets_per_second
+            entry["touched"].setdefault(idx, client.churn_interval)
+
+    def _start_ramp(self, campaign_id, clients, step):
+        """Линейное изменение скорости клиентов до step["pps"] за step["over"] секунд"""
+        targets = [self.client_manager.clients[idx] for idx in clients]
+        steps_total = max(1, int(round(step["over"] / step["step"])))
+        ramp = {
+            "start": [c.packets_per_second for c in targets],
+            "done": 0,
+            "timer": None
+        }
+
+        def ramp_step():
+            ramp["done"] += 1
+            fraction = min(1.0, ramp["done"] / steps_total)
+            for client, start in zip(targets, ramp["start"]):
+                client.update_rate(int(start + (step["pps"] - start) * fraction))
+            if ramp["done"] >= steps_total:
+                ramp["timer"].cancel()
 
-        # После завершения атаки восстанавливаем клиента
-        client.update_rate(client.default_rate)
+        ramp["timer"] = self.scheduler.call_every(step["step"], ramp_step)
+        entry = self.active_campaigns.get(campaign_id)
+        if entry is not None:
+            entry["timers"].append(ramp["timer"])
 
-        print(f"[Attack] Stop {attack_type} on client #{client_index}")
+    def _finish_campaign(self, campaign_id):
+        """Все шаги отработали; атаки без duration продолжают идти до остановки"""
+        with self.lock:
+            entry = self.active_campaigns.get(campaign_id)
+            if entry is None:
+                return
+            entry["finished"] = True
+        print(f"[Campaign] Steps finished {entry['name']}")
+        self._release_campaign(campaign_id)
 
-        # --- АВТОУДАЛЕНИЕ АТАКИ ---
-        if attack_id in self.active_attacks:
-            del self.active_attacks[attack_id]
+    def _release_campaign(self, campaign_id):
+        """Удалить завершённый сценарий, если у него не осталось активных атак"""
+        with self.lock:
+            entry = self.active_campaigns.get(campaign_id)
+            if entry is None or not entry["finished"]:
+                return
+            if any(info["campaign_id"] == campaign_id for info in self.active_attacks.values()):
+                return
+            self.active_campaigns.pop(campaign_id)
+        print(f"[Campaign] Finished {entry['name']}")
 
     # -----------------------------------------------------
-    # ATTACK IMPLEMENTATIONS
+    # ATTACK IMPLEMENTATIONS — один шаг атаки, вызывается планировщиком
     # -----------------------------------------------------
 
     def _attack_syn_flood(self, attack_id, client):
-        while self.active_attacks[attack_id]["running"]:
-            client.update_rate(client.packets_per_second + 5)
-            time.sleep(0.3)
+        client.update_rate(client.packets_per_second + 5)
 
     def _attack_function_spam(self, attack_id, client):
-        while self.active_attacks[attack_id]["running"]:
-            client.update_rate(client.packets_per_second + 1)
-            time.sleep(0.2)
+        client.update_rate(client.packets_per_second + 1)
 
     def _attack_random_packets(self, attack_id, client):
-        while self.active_attacks[attack_id]["running"]:
-            client.update_rate(random.randint(5, 50))
-            time.sleep(0.2)
+        client.update_rate(random.randint(5, 50))
 
     def _attack_slowloris(self, attack_id, client):
-        while self.active_attacks[attack_id]["running"]:
-            client.update_rate(max(1, client.packets_per_second - 1))
-            time.sleep(1)
+        client.update_rate(max(1, client.packets_per_second - 1))
@@ -0,0 +1,47 @@
+# modules/backend_module.py
+from modules.server_module import ModbusTCPServer
+from modules.client_module import ModbusClientWorker
+
+
+class NativeBackend:
+    """Собственная реализация: ModbusTCPServer + ModbusClientWorker"""
+
+    name = "native"
+
+    def create_server(self, host="127.0.0.1", port=15020, data_broker=None, **kwargs):
+        return ModbusTCPServer(host=host, port=port, data_broker=data_broker, **kwargs)
+
+    def create_client(self, host="127.0.0.1", port=15020, **kwargs):
+        return ModbusClientWorker(host=host, port=port, **kwargs)
+
+
+class PymodbusBackend:
+    """
+    Асинхронные сервер и клиент pymodbus с тем же интерфейсом.
+    pymodbus импортируется только при создании объектов.
+    """
+
+    name = "pymodbus"
+
+    def create_server(self, host="127.0.0.1", port=15020, data_broker=None, **kwargs):
+        from modules.pymodbus_backend import PymodbusTCPServer
+        return PymodbusTCPServer(host=host, port=port, data_broker=data_broker, **kwargs)
+
+    def create_client(self, host="127.0.0.1", port=15020, **kwargs):
+        from modules.pymodbus_backend import PymodbusClientWorker
+        return PymodbusClientWorker(host=host, port=port, **kwargs)
+
+
+BACKENDS = {
+    NativeBackend.name: NativeBackend,
+    PymodbusBackend.name: PymodbusBackend,
+}
+
+
+def get_backend(backend="native"):
+    """Вернуть backend по имени (или сам объект backend, если он уже создан)"""
+    if not isinstance(backend, str):
+        return backend
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend: {backend} (available: {', '.join(BACKENDS)})")
+    return BACKENDS[backend]()
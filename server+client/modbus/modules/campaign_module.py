@@ -0,0 +1,150 @@
+# modules/campaign_module.py
+import json
+
+
+ATTACK_TYPES = ("SYN Flood", "Function Spam", "Random Packets", "Slowloris")
+ACTIONS = ("attack", "set_rate", "set_churn", "ramp", "stop_all")
+
+
+class CampaignError(ValueError):
+    pass
+
+
+def parse_clients(spec):
+    """
+    Номера клиентов в сценарии — как в GUI, с единицы.
+    Допускается: 5, "1-50", "1,3,7-9", [1, 2, "10-12"].
+    Возвращает отсортированный список индексов (с нуля).
+    """
+    if isinstance(spec, int):
+        parts = [spec]
+    elif isinstance(spec, str):
+        parts = [p.strip() for p in spec.split(",") if p.strip()]
+    elif isinstance(spec, list):
+        parts = spec
+    else:
+        raise CampaignError(f"Invalid clients spec: {spec!r}")
+
+    indexes = set()
+    for part in parts:
+        if isinstance(part, int):
+            first = last = part
+        else:
+            bounds = str(part).split("-")
+            try:
+                first = int(bounds[0])
+                last = int(bounds[-1])
+            except ValueError:
+                raise CampaignError(f"Invalid clients spec: {part!r}")
+        if first < 1 or last < first:
+            raise CampaignError(f"Invalid clients range: {part!r}")
+        indexes.update(range(first - 1, last))
+    if not indexes:
+        raise CampaignError(f"Empty clients spec: {spec!r}")
+    return sorted(indexes)
+
+
+def _number(raw, key, number, cast=float, default=None, minimum=None, positive=False):
+    """Числовое поле шага с проверкой; default=None — поле обязательно"""
+    value = raw.get(key, default)
+    if value is None:
+        raise CampaignError(f"Step #{number}: '{key}' is required")
+    if isinstance(value, bool):
+        raise CampaignError(f"Step #{number}: '{key}' must be a number, got {value!r}")
+    try:
+        value = cast(value)
+    except (TypeError, ValueError):
+        raise CampaignError(f"Step #{number}: '{key}' must be a number, got {value!r}")
+    if positive and value <= 0:
+        raise CampaignError(f"Step #{number}: '{key}' must be > 0")
+    if minimum is not None and value < minimum:
+        raise CampaignError(f"Step #{number}: '{key}' must be >= {minimum}")
+    return value
+
+
+def _parse_step(raw, number):
+    if not isinstance(raw, dict):
+        raise CampaignError(f"Step #{number}: expected object")
+
+    action = raw.get("action", "attack")
+    if action not in ACTIONS:
+        raise CampaignError(f"Step #{number}: unknown action {action!r}")
+
+    step = {
+        "at": _number(raw, "at", number, default=0, minimum=0),
+        "action": action,
+    }
+
+    if action == "stop_all":
+        return step
+
+    try:
+        step["clients"] = parse_clients(raw.get("clients", 1))
+    except CampaignError as e:
+        raise CampaignError(f"Step #{number}: {e}")
+
+    if action == "attack":
+        attack_type = raw.get("attack_type")
+        if attack_type not in ATTACK_TYPES:
+            raise CampaignError(f"Step #{number}: unknown attack_type {attack_type!r}")
+        step["attack_type"] = attack_type
+        step["duration"] = None
+        if raw.get("duration") is not None:
+            step["duration"] = _number(raw, "duration", number, positive=True)
+
+    elif action == "set_rate":
+        step["pps"] = _number(raw, "pps", number, cast=int, positive=True)
+
+    elif action == "set_churn":
+        # Переподключение каждые interval секунд; 0 — выключить churn
+        step["interval"] = _number(raw, "interval", number, minimum=0)
+
+    elif action == "ramp":
+        # Целевая скорость: pps — на каждого клиента, total_pps — суммарно
+        if "total_pps" in raw:
+            total = _number(raw, "total_pps", number, cast=int, positive=True)
+            step["pps"] = max(1, total // len(step["clients"]))
+        else:
+            step["pps"] = _number(raw, "pps", number, cast=int, positive=True)
+        step["over"] = _number(raw, "over", number, default=0, minimum=0)
+        step["step"] = _number(raw, "step", number, default=0.1, positive=True)
+
+    return step
+
+
+def load_campaign(path):
+    """
+    Загрузка сценария атак из JSON-файла:
+
+    {
+        "name": "overload",
+        "steps": [
+            {"at": 30, "action": "attack", "attack_type": "Slowloris", "clients": "1-50", "duration": 120},
+            {"at": 60, "action": "ramp", "clients": "1-10", "total_pps": 20000, "over": 30},
+            {"at": 90, "action": "set_churn", "clients": "11-20", "interval": 2},
+            {"at": 200, "action": "stop_all"}
+        ]
+    }
+
+    Время "at" отсчитывается в секундах от запуска сценария.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        try:
+            data = json.load(f)
+        except json.JSONDecodeError as e:
+            raise CampaignError(f"Invalid campaign file {path}: {e}")
+
+    if isinstance(data, list):
+        data = {"steps": data}
+    if not isinstance(data, dict):
+        raise CampaignError(f"Campaign {path}: expected object or list of steps")
+    steps = data.get("steps")
+    if not isinstance(steps, list) or not steps:
+        raise CampaignError(f"Campaign {path} has no steps")
+
+    parsed = [_parse_step(raw, number) for number, raw in enumerate(steps, start=1)]
+    parsed.sort(key=lambda s: s["at"])
+    return {
+        "name": data.get("name", path),
+        "steps": parsed,
+    }
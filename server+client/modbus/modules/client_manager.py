@@ -1,17 +1,30 @@
 from modules.client_module import ModbusClientWorker
+from modules.backend_module import get_backend
 
 
 class ClientManager:
-    def __init__(self, host="127.0.0.1", port=15020):
+    def __init__(self, host="127.0.0.1", port=15020, backend="native",
+                 framing="mbap", transport="tcp", serial_port=None, unit_ids=None):
         self.host = host
         self.port = port
+        self.backend = get_backend(backend)
+        self.framing = framing
+        self.transport = transport
+        self.serial_port = serial_port
+        self.unit_ids = unit_ids
         self.clients: list[ModbusClientWorker] = []
-        self.max_clients = 10
+        # На последовательной линии может быть только один мастер: ответы
+        # сопоставляются по порядку (FIFO), и второй клиент забирал бы чужие
+        self.max_clients = 1 if transport == "pty" else 10
 
     def add_client(self, packets_per_second=10):
         if len(self.clients) >= self.max_clients:
             return False
-        client = ModbusClientWorker(host=self.host, port=self.port, packets_per_second=packets_per_second)
+        client = self.backend.create_client(
+            host=self.host, port=self.port, packets_per_second=packets_per_second,
+            framing=self.framing, transport=self.transport, serial_port=self.serial_port,
+            unit_ids=self.unit_ids
+        )
         client.start()
         self.clients.append(client)
         return True
@@ -35,8 +48,25 @@ class ClientManager:
     def get_total_sent_packets(self):
         return sum(c.total_sent_packets for c in self.clients)
 
+    def set_client_pipeline(self, client_index, pipeline_window):
+        if 0 <= client_index < len(self.clients):
+            self.clients[client_index].set_pipeline(pipeline_window)
+
+    def set_client_churn(self, client_index, churn_interval):
+        if 0 <= client_index < len(self.clients):
+            self.clients[client_index].set_churn(churn_interval)
+
     def get_active_clients(self):
-        return len(self.clients)
+        """Клиенты с установленным соединением (переподключающиеся не считаются)"""
+        return sum(1 for c in self.clients if c.connected)
 
     def get_total_packets_per_second(self):
-        return sum(c.packets_per_second for c in self.clients)
+        return sum(c.packets_per_second for c in self.clients if c.connected)
+
+    def get_connection_stats(self):
+        return {
+            "connected": self.get_active_clients(),
+            "connects": sum(c.connects for c in self.clients),
+            "connect_failures": sum(c.connect_failures for c in self.clients),
+            "disconnects": sum(c.disconnects for c in self.clients)
+        }
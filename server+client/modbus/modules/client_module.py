@@ -3,33 +3,106 @@ import threading
 import time
 import random
 import struct
+import select
+from collections import deque
+
+from modules.rtu_module import RTUDeframer, build_rtu_frame, open_serial
 
 
 class ModbusClientWorker:
     """
     Один клиент, который держит соединение с сервером и отправляет пакеты с заданной частотой (packets_per_second).
+
+    Соединение проходит состояния DISCONNECTED -> CONNECTING -> CONNECTED; при ошибке
+    подключения или обрыве клиент уходит в BACKOFF и переподключается с экспоненциальной
+    задержкой со случайным разбросом (full jitter), чтобы не устраивать шторм переподключений.
+    В режиме churn соединение принудительно закрывается и открывается заново каждые churn_interval секунд.
+
+    В режиме pipelining (pipeline_window=N) одновременно без ответа может быть не более N запросов:
+    каждый ответ возвращает кредит на отправку, а накопившиеся запросы уходят одной записью.
+
+    framing="rtu" — RTU-кадры с CRC вместо MBAP (ответы сопоставляются по порядку, FIFO);
+    transport="pty" — подключение к tty-устройству serial_port вместо TCP (всегда RTU).
     """
 
-    def __init__(self, host="127.0.0.1", port=15020, packets_per_second=10):
+    STATE_DISCONNECTED = "disconnected"
+    STATE_CONNECTING = "connecting"
+    STATE_CONNECTED = "connected"
+    STATE_BACKOFF = "backoff"
+    STATE_STOPPED = "stopped"
+
+    # Сколько последних задержек хранится до drain_latencies(): без потребителя
+    # (ImpactMonitor, бенчмарк) старые значения вытесняются, память не растёт
+    LATENCY_BUFFER = 65536
+
+    def __init__(self, host="127.0.0.1", port=15020, packets_per_second=10, response_timeout=2.0,
+                 connect_timeout=2.0, backoff_base=0.1, backoff_max=10.0, churn_interval=None,
+                 pipeline_window=None, framing="mbap", transport="tcp", serial_port=None, unit_ids=None):
+        if framing not in ("mbap", "rtu"):
+            raise ValueError(f"Unknown framing: {framing}")
+        if transport not in ("tcp", "pty"):
+            raise ValueError(f"Unknown transport: {transport}")
         self.host = host
         self.port = port
+        self.transport = transport
+        self.framing = "rtu" if transport == "pty" else framing
+        self.serial_port = serial_port
+        # Юниты, к которым обращается клиент (через шлюз — много юнитов)
+        self.unit_ids = list(unit_ids) if unit_ids else [1]
         self.packets_per_second = packets_per_second
         self.send_interval = 1.0 / packets_per_second
+        self.response_timeout = response_timeout
         self.running = False
         self.thread = None
         self.sent_packets = 0
         self.total_sent_packets = 0
         self.sock = None
 
+        # Жизненный цикл соединения
+        self.state = self.STATE_DISCONNECTED
+        self.connect_timeout = connect_timeout
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.churn_interval = churn_interval
+        self._stop_event = threading.Event()
+
+        # Pipelining: окно запросов в полёте (None — без ограничения)
+        self.pipeline_window = None
+        self.set_pipeline(pipeline_window)
+        self.max_in_flight = 0
+        self.window_stalls = 0     # тиков отправки, пропущенных из-за заполненного окна
+        self.coalesced_writes = 0  # записей, в которые ушло больше одного запроса
+        self._due = 0              # запросов, которые пора отправить
+
+        # Метрики соединения
+        self.connects = 0
+        self.connect_failures = 0
+        self.disconnects = 0
+        self.last_connect_latency = None
+        self._connect_latency_total = 0.0
+
+        # Метрики ответов
+        self.received_packets = 0
+        self.errors = 0        # ошибки отправки и exception-ответы сервера
+        self.timeouts = 0      # запросы без ответа дольше response_timeout
+        self._latencies = deque(maxlen=self.LATENCY_BUFFER)   # задержки (сек) с последнего drain_latencies()
+        self._pending = {}     # transaction_id -> время отправки
+        self._transaction_id = 0
+        self._recv_buffer = b""
+        self._deframer = None
+        self.crc_errors = 0
+
     def start(self):
         if self.running:
             return
         self.running = True
+        self._stop_event.clear()
         self.thread = threading.Thread(target=self._run, daemon=True)
         self.thread.start()
 
     def stop(self):
         self.running = False
+        self._stop_event.set()
         if self.sock:
             try:
                 self.sock.close()
@@ -40,44 +113,272 @@ class ModbusClientWorker:
         self.packets_per_second = max(1, packets_per_second)
         self.send_interval = 1.0 / self.packets_per_second
 
+    def set_churn(self, churn_interval):
+        """Режим churn: переподключаться каждые churn_interval секунд (None — выключить)"""
+        self.churn_interval = churn_interval if churn_interval and churn_interval > 0 else None
+
+    def set_pipeline(self, pipeline_window):
+        """Окно pipelining: 1..N запросов в полёте (None/0 — выключить)"""
+        self.pipeline_window = max(1, int(pipeline_window)) if pipeline_window else None
+
+    @property
+    def in_flight(self):
+        return len(self._pending)
+
+    @property
+    def connected(self):
+        return self.state == self.STATE_CONNECTED
+
+    @property
+    def avg_connect_latency(self):
+        return self._connect_latency_total / self.connects if self.connects else None
+
+    def drain_latencies(self):
+        """Забрать накопленные задержки ответов (сек) и начать новый набор"""
+        latencies = self._latencies
+        self._latencies = deque(maxlen=self.LATENCY_BUFFER)
+        return list(latencies)
+
     def _run(self):
+        attempt = 0
+        while self.running:
+            if not self._connect():
+                attempt += 1
+                self._backoff(attempt)
+                continue
+
+            received_before = self.received_packets
+            churned = False
+            try:
+                churned = self._session()
+            except Exception:
+                pass
+            finally:
+                self._disconnect()
+
+            # Счётчик попыток сбрасывается, только если сессия была рабочей (пришёл
+            # хотя бы один ответ): сервер, который принимает и сразу закрывает
+            # соединение, должен получать растущую задержку, а не шторм переподключений
+            if self.received_packets > received_before:
+                attempt = 0
+            if self.running and not churned:
+                attempt += 1
+                self._backoff(attempt)
+
+        self.state = self.STATE_STOPPED
+
+    def _connect(self):
+        self.state = self.STATE_CONNECTING
+        started = time.perf_counter()
+        if self.transport == "pty":
+            try:
+                sock = open_serial(self.serial_port)
+            except (OSError, TypeError):
+                self.connect_failures += 1
+                return False
+        else:
+            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            sock.settimeout(self.connect_timeout)
+            try:
+                sock.connect((self.host, self.port))
+            except OSError:
+                sock.close()
+                self.connect_failures += 1
+                return False
+
+        self._record_connect(time.perf_counter() - started)
+        self.sock = sock
+        self._deframer = RTUDeframer(request=False) if self.framing == "rtu" else None
+        if not self.running:
+            # stop() мог прийти, пока шло подключение
+            sock.close()
+            return False
+        return True
+
+    def _record_connect(self, latency):
+        self.last_connect_latency = latency
+        self._connect_latency_total += latency
+        self.connects += 1
+        self.state = self.STATE_CONNECTED
+
+    def _backoff_delay(self, attempt):
+        """Экспоненциальная задержка с полным случайным разбросом"""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def _backoff(self, attempt):
+        if not self.running:
+            return
+        self.state = self.STATE_BACKOFF
+        self._stop_event.wait(self._backoff_delay(attempt))
+
+    def _disconnect(self):
+        if self.running:
+            self.disconnects += 1
         try:
-            self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            self.sock.settimeout(2)
-            self.sock.connect((self.host, self.port))
-
-            next_send = time.time()
-            while self.running:
-                now = time.time()
-                if now >= next_send:
-                    packet = self._generate_modbus_request()
-                    try:
-                        self.sock.sendall(packet)
-                        self.sent_packets += 1
-                        self.total_sent_packets += 1
-                    except:
-                        pass
-                    next_send += self.send_interval
-                else:
-                    time.sleep(min(0.01, next_send - now))
-
-        except Exception:
+            self.sock.close()
+        except:
             pass
-        finally:
-            if self.sock:
-                try:
-                    self.sock.close()
-                except:
-                    pass
+        # Запросы, оставшиеся без ответа, считаем потерянными
+        self.errors += len(self._pending)
+        self._pending.clear()
+        self._due = 0
+        self._recv_buffer = b""
+        if self.running:
+            self.state = self.STATE_DISCONNECTED
+
+    def _session(self):
+        """Обмен по установленному соединению; True — плановое закрытие в режиме churn"""
+        session_start = time.time()
+        next_send = session_start
+        next_timeout_check = next_send + self.response_timeout
+        while self.running:
+            now = time.time()
+            if self.churn_interval and now - session_start >= self.churn_interval:
+                self._drain_pending()
+                return True
+
+            if now >= next_send:
+                next_send = self._queue_due(now, next_send)
+
+            if self._due:
+                self._flush()
+
+            # Ожидаем следующую отправку, попутно вычитывая ответы (они возвращают кредиты)
+            readable, _, _ = select.select([self.sock], [], [], max(0.0, min(0.01, next_send - time.time())))
+            if readable:
+                self._read_responses()
+
+            if now >= next_timeout_check:
+                self._expire_pending()
+                next_timeout_check = now + 0.1
+        return False
+
+    def _drain_pending(self):
+        """
+        Плановое закрытие (churn): новые запросы не отправляются, ответы на уже
+        отправленные дочитываются, чтобы не считать их ошибками при закрытии.
+        Не пришедшие за response_timeout считаются таймаутами, как обычно.
+        """
+        self._due = 0
+        deadline = time.time() + self.response_timeout
+        while self._pending and self.running and time.time() < deadline:
+            readable, _, _ = select.select([self.sock], [], [], max(0.0, min(0.01, deadline - time.time())))
+            if readable:
+                self._read_responses()
+        self._expire_pending()
+
+    def _queue_due(self, now, next_send):
+        """Поставить в очередь наступившие тики отправки, вернуть время следующего тика"""
+        ticks = int((now - next_send) / self.send_interval) + 1
+        queued = self._due + ticks
+        window = self.pipeline_window
+        if window:
+            # Очередь ограничена свободными кредитами окна; каждый тик, для
+            # которого кредита нет (в полёте уже window запросов), — простой
+            credits = max(0, window - len(self._pending))
+            if queued > credits:
+                self.window_stalls += queued - credits
+            self._due = min(queued, credits)
+        else:
+            # Без окна — не больше секунды отправки в очереди
+            self._due = min(queued, max(1, int(self.packets_per_second)))
+        return next_send + ticks * self.send_interval
+
+    def _flush(self):
+        """Отправить накопившиеся запросы в пределах окна одной записью"""
+        count = self._due
+        if self.pipeline_window:
+            count = min(count, self.pipeline_window - len(self._pending))
+        if count <= 0:
+            return
+
+        transaction_ids = []
+        packets = []
+        for _ in range(count):
+            packets.append(self._generate_modbus_request())
+            transaction_ids.append(self._transaction_id)
+        try:
+            self.sock.sendall(b"".join(packets))
+        except OSError:
+            self.errors += count
+            raise
+
+        sent_at = time.perf_counter()
+        for transaction_id in transaction_ids:
+            self._pending[transaction_id] = sent_at
+        self._due -= count
+        self.sent_packets += count
+        self.total_sent_packets += count
+        if count > 1:
+            self.coalesced_writes += 1
+        if len(self._pending) > self.max_in_flight:
+            self.max_in_flight = len(self._pending)
+
+    def _read_responses(self):
+        data = self.sock.recv(4096)
+        if not data:
+            raise ConnectionError("connection closed by server")
+        received_at = time.perf_counter()
+        if self._deframer:
+            self._read_rtu_responses(data, received_at)
+            return
+        buf = self._recv_buffer + data
+
+        # Разбор MBAP: 6 байт заголовка + length (unit id + PDU)
+        offset = 0
+        while len(buf) - offset >= 8:
+            transaction_id, _, length = struct.unpack_from(">HHH", buf, offset)
+            frame_end = offset + 6 + length
+            if frame_end > len(buf):
+                break
+            function_code = buf[offset + 7]
+            offset = frame_end
+
+            sent_at = self._pending.pop(transaction_id, None)
+            if sent_at is None:
+                continue
+            self.received_packets += 1
+            if function_code & 0x80:
+                self.errors += 1
+            else:
+                self._latencies.append(received_at - sent_at)
+        self._recv_buffer = buf[offset:]
+
+    def _read_rtu_responses(self, data, received_at):
+        crc_errors = self._deframer.crc_errors
+        frames = self._deframer.feed(data)
+        self.crc_errors += self._deframer.crc_errors - crc_errors
+
+        # В RTU нет transaction id: ответы приходят в порядке запросов
+        for frame in frames:
+            if not self._pending:
+                break
+            transaction_id = next(iter(self._pending))
+            sent_at = self._pending.pop(transaction_id)
+            self.received_packets += 1
+            if frame[1] & 0x80:
+                self.errors += 1
+            else:
+                self._latencies.append(received_at - sent_at)
+
+    def _expire_pending(self):
+        deadline = time.perf_counter() - self.response_timeout
+        expired = [tid for tid, sent_at in self._pending.items() if sent_at < deadline]
+        for tid in expired:
+            del self._pending[tid]
+        self.timeouts += len(expired)
 
     def _generate_modbus_request(self) -> bytes:
-        transaction_id = random.randint(0, 65535)
+        self._transaction_id = (self._transaction_id + 1) & 0xFFFF
+        transaction_id = self._transaction_id
         protocol_id = 0
-        unit_id = 1
+        unit_id = random.choice(self.unit_ids)
         function_code = 3
         start_address = random.randint(0, 50)
         register_count = random.randint(1, 5)
         pdu = struct.pack(">BHH", function_code, start_address, register_count)
+        if self.framing == "rtu":
+            return build_rtu_frame(unit_id, pdu)
         length = len(pdu) + 1
         mbap = struct.pack(">HHHB", transaction_id, protocol_id, length, unit_id)
         return mbap + pdu
@@ -0,0 +1,154 @@
+# modules/datastore_module.py
+from array import array
+
+
+# Таблицы Modbus
+COILS = 0
+DISCRETE_INPUTS = 1
+HOLDING_REGISTERS = 2
+INPUT_REGISTERS = 3
+
+PAGE_BITS = 6
+PAGE_SIZE = 1 << PAGE_BITS          # регистров (или бит) на страницу
+ADDRESS_SPACE = 0x10000
+
+_ZERO_PAGE = array("H", bytes(PAGE_SIZE * 2))
+
+
+def _page_key(table, page_no):
+    # Один int вместо кортежа (table, page_no) — меньше аллокаций на запрос
+    return (table << 16) | page_no
+
+
+class UnitTemplate:
+    """
+    Общий шаблон адресного пространства. Страницы шаблона разделяются всеми
+    юнитами, созданными по нему, и копируются в юнит только при первой записи.
+    """
+
+    def __init__(self, name="default"):
+        self.name = name
+        self.pages = {}
+
+    def set_values(self, table, address, values):
+        _write(self.pages, None, table, address, values)
+
+    def get_values(self, table, address, count):
+        return _read(self.pages, None, table, address, count)
+
+
+class UnitStore:
+    """
+    Адресное пространство одного юнита. Пока в юнит не писали, у него нет
+    собственных страниц (pages is None) и все чтения идут в шаблон.
+    """
+
+    __slots__ = ("template", "pages")
+
+    def __init__(self, template=None):
+        self.template = template
+        self.pages = None
+
+    def get_values(self, table, address, count):
+        shared = self.template.pages if self.template else None
+        return _read(self.pages, shared, table, address, count)
+
+    def set_values(self, table, address, values):
+        if self.pages is None:
+            self.pages = {}
+        shared = self.template.pages if self.template else None
+        _write(self.pages, shared, table, address, values)
+
+    def allocated_pages(self):
+        return len(self.pages) if self.pages else 0
+
+
+def _read(own, shared, table, address, count):
+    values = []
+    end = address + count
+    while address < end:
+        page_no = address >> PAGE_BITS
+        key = _page_key(table, page_no)
+        page = None
+        if own:
+            page = own.get(key)
+        if page is None and shared:
+            page = shared.get(key)
+        if page is None:
+            page = _ZERO_PAGE
+        start = address & (PAGE_SIZE - 1)
+        stop = min(PAGE_SIZE, start + end - address)
+        values.extend(page[start:stop])
+        address += stop - start
+    return values
+
+
+def _write(own, shared, table, address, values):
+    index = 0
+    address_end = address + len(values)
+    while address < address_end:
+        key = _page_key(table, address >> PAGE_BITS)
+        page = own.get(key)
+        if page is None:
+            # copy-on-write: своя копия страницы шаблона (или пустая страница)
+            template_page = shared.get(key) if shared else None
+            page = array("H", template_page if template_page is not None else _ZERO_PAGE)
+            own[key] = page
+        start = address & (PAGE_SIZE - 1)
+        stop = min(PAGE_SIZE, start + address_end - address)
+        page[start:stop] = array("H", values[index:index + stop - start])
+        index += stop - start
+        address += stop - start
+
+
+class GatewayDataStore:
+    """
+    Хранилище шлюза: юниты по адресу (dict, O(1) на запрос).
+
+    Адрес юнита — unit id запроса плюс unit_base сервера, поэтому одно
+    хранилище может обслуживать несколько серверов/портов и больше 247 юнитов.
+    auto_create — создавать неизвестные юниты по default_template при первом
+    обращении; иначе сервер отвечает исключением 0x0B (gateway target failed).
+    """
+
+    def __init__(self, auto_create=False, default_template=None):
+        self.auto_create = auto_create
+        self.default_template = default_template or UnitTemplate()
+        self.units = {}
+
+    def __len__(self):
+        return len(self.units)
+
+    def add_unit(self, unit_address, template=None):
+        unit = UnitStore(template or self.default_template)
+        self.units[unit_address] = unit
+        return unit
+
+    def add_units(self, unit_addresses, template=None):
+        template = template or self.default_template
+        for unit_address in unit_addresses:
+            self.units[unit_address] = UnitStore(template)
+
+    def remove_unit(self, unit_address):
+        return self.units.pop(unit_address, None) is not None
+
+    def get_unit(self, unit_address):
+        unit = self.units.get(unit_address)
+        if unit is None and self.auto_create:
+            unit = self.add_unit(unit_address)
+        return unit
+
+    def memory_stats(self):
+        """Сколько юнитов держат собственные страницы и сколько страниц выделено"""
+        own_pages = 0
+        dirty_units = 0
+        for unit in self.units.values():
+            if unit.pages:
+                dirty_units += 1
+                own_pages += len(unit.pages)
+        return {
+            "units": len(self.units),
+            "dirty_units": dirty_units,
+            "own_pages": own_pages,
+            "own_page_bytes": own_pages * PAGE_SIZE * _ZERO_PAGE.itemsize
+        }
@@ -0,0 +1,304 @@
+# modules/impact_module.py
+import os
+import json
+import time
+import queue
+import bisect
+import threading
+from collections import deque
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+
+# Границы корзин гистограммы задержек (сек): геометрическая шкала 50 мкс .. ~13 с
+LATENCY_BUCKETS = [0.00005 * (1.25 ** i) for i in range(57)]
+
+
+def _percentile(histogram, q):
+    """Перцентиль по гистограмме — верхняя граница корзины"""
+    total = sum(histogram)
+    if total == 0:
+        return None
+    rank = q * total
+    seen = 0
+    for idx, count in enumerate(histogram):
+        seen += count
+        if seen >= rank:
+            return LATENCY_BUCKETS[min(idx, len(LATENCY_BUCKETS) - 1)]
+    return LATENCY_BUCKETS[-1]
+
+
+def _mean(values):
+    values = [v for v in values if v is not None]
+    return sum(values) / len(values) if values else None
+
+
+class ImpactMonitor:
+    """
+    Фоновая выборка метрик сервера и легитимных клиентов для отчётов о влиянии атак.
+
+    Раз в sample_interval секунд планировщик снимает уже существующие счётчики
+    (server.packets_per_sec, счётчики клиентов, psutil) — на пути пакета
+    ничего не добавляется. Для каждой атаки сравниваются окна:
+    baseline (до старта), during (атака) и recovery (после остановки).
+
+    Выборка описывает интервал [start, end] — приращения счётчиков клиентов с
+    прошлой выборки, а server_pps — свой интервал [server_start, server_end]
+    (последняя полная секунда сервера). В окно попадает только то, чей интервал
+    целиком лежит внутри окна.
+
+    process_cpu_percent / process_rss_bytes — psutil по всему процессу
+    (в GUI это сервер вместе с клиентами и планировщиком), а не только сервер.
+
+    Выборка, psutil и запись отчётов выполняются в собственном потоке монитора:
+    планировщик только ставит задачу в очередь и не ждёт ввода-вывода.
+    """
+
+    def __init__(self, server, client_manager, scheduler, attacked_clients,
+                 sample_interval=0.5, baseline_seconds=10, recovery_seconds=30,
+                 history_seconds=900, reports_dir="reports"):
+        self.server = server
+        self.client_manager = client_manager
+        self.scheduler = scheduler
+        self.attacked_clients = attacked_clients  # callable -> set индексов клиентов под атакой
+        self.sample_interval = sample_interval
+        self.baseline_seconds = baseline_seconds
+        self.recovery_seconds = recovery_seconds
+        self.reports_dir = reports_dir
+
+        self.samples = deque(maxlen=int(history_seconds / sample_interval))
+        self.lock = threading.Lock()
+        self.tracked = {}   # attack_id -> {"attack_type", "client_index", "started", "stopped"}
+        self.reports = {}   # attack_id -> report
+
+        self._process = psutil.Process() if psutil else None
+        if self._process:
+            self._process.cpu_percent(None)
+        self._last_counters = {}
+        self._last_sample = None
+
+        self._jobs = queue.Queue()
+        self._worker = threading.Thread(target=self._run_jobs, daemon=True)
+        self._worker.start()
+        self._timer = self.scheduler.call_every(self.sample_interval, self._jobs.put, (self._sample,))
+
+    # -----------------------------------------------------
+    # PUBLIC API — вызывается из AttackManager
+    # -----------------------------------------------------
+
+    def attack_started(self, attack_id, attack_type, client_index):
+        with self.lock:
+            self.tracked[attack_id] = {
+                "attack_type": attack_type,
+                "client_index": client_index,
+                "started": time.time(),
+                "stopped": None
+            }
+
+    def attack_stopped(self, attack_id):
+        with self.lock:
+            info = self.tracked.get(attack_id)
+            if info is None or info["stopped"] is not None:
+                return
+            info["stopped"] = time.time()
+        self.scheduler.call_later(self.recovery_seconds, self._jobs.put, (self._finalize, attack_id))
+
+    def get_report(self, attack_id):
+        with self.lock:
+            return self.reports.get(attack_id)
+
+    def list_reports(self):
+        with self.lock:
+            return list(self.reports.values())
+
+    def stop(self):
+        self._timer.cancel()
+        self._jobs.put(None)
+
+    def _run_jobs(self):
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                return
+            func, *args = job
+            try:
+                func(*args)
+            except Exception as e:
+                print(f"[Impact] ERROR in {func.__name__}: {e}")
+
+    # -----------------------------------------------------
+    # SAMPLING
+    # -----------------------------------------------------
+
+    def _sample(self):
+        now = time.time()
+        start = self._last_sample if self._last_sample is not None else now - self.sample_interval
+        self._last_sample = now
+        attacked = self.attacked_clients()
+
+        histogram = [0] * (len(LATENCY_BUCKETS) + 1)
+        sent = errors = timeouts = 0
+        last_counters = {}
+        for idx, client in enumerate(list(self.client_manager.clients)):
+            latencies = client.drain_latencies()
+            counters = (client.total_sent_packets, client.errors, client.timeouts)
+            last = self._last_counters.get(client, counters)
+            last_counters[client] = counters
+            if idx in attacked:
+                continue
+            for latency in latencies:
+                histogram[bisect.bisect_left(LATENCY_BUCKETS, latency)] += 1
+            sent += counters[0] - last[0]
+            errors += counters[1] - last[1]
+            timeouts += counters[2] - last[2]
+        self._last_counters = last_counters
+
+        server_pps = server_window = None
+        if self.server is not None:
+            server_pps = self.server.packets_per_sec
+            # packets_per_sec — счётчик за последнюю полную секунду сервера
+            server_window = getattr(self.server, "packets_per_sec_window", None) or (now - 1.0, now)
+
+        cpu = rss = None
+        if self._process:
+            cpu = self._process.cpu_percent(None)
+            rss = self._process.memory_info().rss
+
+        with self.lock:
+            self.samples.append({
+                "start": start,
+                "end": now,
+                "server_pps": server_pps,
+                "server_start": server_window[0] if server_window else None,
+                "server_end": server_window[1] if server_window else None,
+                "latency_histogram": histogram,
+                "sent": sent,
+                "errors": errors,
+                "timeouts": timeouts,
+                "process_cpu_percent": cpu,
+                "process_rss_bytes": rss
+            })
+
+    def _window(self, start, end):
+        """Выборки, интервал клиентских счётчиков которых целиком внутри [start, end]"""
+        with self.lock:
+            return [s for s in self.samples if start <= s["start"] and s["end"] <= end]
+
+    def _server_pps(self, start, end):
+        """Средний server_pps по секундам сервера, целиком лежащим внутри [start, end]"""
+        seconds = {}
+        with self.lock:
+            for s in self.samples:
+                if s["server_pps"] is None or s["server_start"] is None:
+                    continue
+                if start <= s["server_start"] and s["server_end"] <= end:
+                    # Соседние выборки видят одну и ту же секунду — считаем её один раз
+                    seconds[s["server_start"]] = s["server_pps"]
+        return _mean(seconds.values())
+
+    def _summarize(self, start, end):
+        samples = self._window(start, end)
+        histogram = [0] * (len(LATENCY_BUCKETS) + 1)
+        for s in samples:
+            for idx, count in enumerate(s["latency_histogram"]):
+                histogram[idx] += count
+        sent = sum(s["sent"] for s in samples)
+        errors = sum(s["errors"] for s in samples)
+        timeouts = sum(s["timeouts"] for s in samples)
+        return {
+            "samples": len(samples),
+            "server_pps": self._server_pps(start, end),
+            "latency_p50": _percentile(histogram, 0.50),
+            "latency_p95": _percentile(histogram, 0.95),
+            "latency_p99": _percentile(histogram, 0.99),
+            "error_rate": errors / sent if sent else 0.0,
+            "timeout_rate": timeouts / sent if sent else 0.0,
+            "process_cpu_percent": _mean(s["process_cpu_percent"] for s in samples),
+            "process_rss_bytes": _mean(s["process_rss_bytes"] for s in samples)
+        }
+
+    def _recovery_time(self, baseline, stopped):
+        """
+        Время от остановки атаки до конца первой выборки, целиком снятой после
+        остановки, у которой метрики вернулись к уровню baseline. Секунда сервера
+        тоже должна начинаться после остановки, иначе в ней ещё трафик атаки.
+        """
+        base_pps = baseline["server_pps"]
+        base_p95 = baseline["latency_p95"]
+        for s in self._window(stopped, stopped + self.recovery_seconds):
+            if base_pps is not None and s["server_pps"] is not None:
+                if s["server_start"] < stopped:
+                    continue
+                if s["server_pps"] < 0.9 * base_pps:
+                    continue
+            p95 = _percentile(s["latency_histogram"], 0.95)
+            latency_ok = base_p95 is None or p95 is None or p95 <= 1.5 * base_p95
+            if latency_ok and s["errors"] == 0 and s["timeouts"] == 0:
+                return max(s["end"], s["server_end"] or 0) - stopped
+        return None
+
+    # -----------------------------------------------------
+    # REPORT
+    # -----------------------------------------------------
+
+    def _finalize(self, attack_id):
+        with self.lock:
+            info = self.tracked.pop(attack_id, None)
+        if info is None:
+            return
+
+        started, stopped = info["started"], info["stopped"]
+        baseline = self._summarize(started - self.baseline_seconds, started)
+        during = self._summarize(started, stopped)
+        recovery = self._summarize(stopped, stopped + self.recovery_seconds)
+
+        def change(key):
+            before, after = baseline[key], during[key]
+            if before is None or after is None:
+                return None
+            return after - before
+
+        def ratio(key):
+            before, after = baseline[key], during[key]
+            if not before or after is None:
+                return None
+            return after / before
+
+        report = {
+            "attack_id": attack_id,
+            "attack_type": info["attack_type"],
+            "client_index": info["client_index"],
+            "started": started,
+            "stopped": stopped,
+            "duration": stopped - started,
+            "baseline": baseline,
+            "during": during,
+            "recovery": recovery,
+            "impact": {
+                "server_pps_ratio": ratio("server_pps"),
+                "latency_p95_ratio": ratio("latency_p95"),
+                "latency_p99_ratio": ratio("latency_p99"),
+                "error_rate_change": change("error_rate"),
+                "timeout_rate_change": change("timeout_rate"),
+                "process_cpu_percent_change": change("process_cpu_percent"),
+                "process_rss_bytes_change": change("process_rss_bytes")
+            },
+            "recovery_time": self._recovery_time(baseline, stopped)
+        }
+
+        with self.lock:
+            self.reports[attack_id] = report
+        path = self._export(report)
+        print(f"[Impact] Report for attack {attack_id} ({info['attack_type']}): {path}")
+
+    def _export(self, report):
+        os.makedirs(self.reports_dir, exist_ok=True)
+        stamp = time.strftime("%Y%m%d_%H%M%S", time.localtime(report["started"]))
+        name = report["attack_type"].replace(" ", "_").lower()
+        path = os.path.join(self.reports_dir, f"attack_{report['attack_id']}_{name}_{stamp}.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        return path
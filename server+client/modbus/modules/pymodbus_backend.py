@@ -0,0 +1,240 @@
+# modules/pymodbus_backend.py
+import time
+import random
+import asyncio
+import inspect
+
+from pymodbus import FramerType
+from pymodbus.client import AsyncModbusTcpClient
+from pymodbus.server import ModbusTcpServer
+from pymodbus.datastore import ModbusServerContext, ModbusSequentialDataBlock
+from pymodbus.exceptions import ConnectionException, ModbusIOException
+
+# ModbusServerContext / ModbusSequentialDataBlock / ModbusDeviceContext объявлены
+# устаревшими и будут удалены в pymodbus 4 — версия ограничена в requirements.txt
+try:
+    from pymodbus.datastore import ModbusDeviceContext
+except ImportError:
+    # pymodbus < 3.10
+    from pymodbus.datastore import ModbusSlaveContext as ModbusDeviceContext
+
+from modules.server_module import ModbusTCPServer
+from modules.client_module import ModbusClientWorker
+
+
+# Имя аргумента unit id изменилось в pymodbus 3.10: slave -> device_id
+_UNIT_KWARG = (
+    "device_id"
+    if "device_id" in inspect.signature(AsyncModbusTcpClient.read_holding_registers).parameters
+    else "slave"
+)
+
+
+_FRAMERS = {"mbap": FramerType.SOCKET, "rtu": FramerType.RTU}
+
+
+class PymodbusTCPServer(ModbusTCPServer):
+    """
+    Асинхронный сервер pymodbus за тем же интерфейсом, что и ModbusTCPServer:
+    start/stop, active_clients, total_packets, packets_per_sec и брокер данных.
+    Запросы считаются через trace_pdu, цикл asyncio живёт в потоке сервера.
+    GatewayDataStore не используется: pymodbus отвечает за все unit id
+    из одного общего набора регистров.
+    """
+
+    def __init__(self, host="127.0.0.1", port=15020, data_broker=None, registers=1000,
+                 framing="mbap", transport="tcp", datastore=None, unit_base=0):
+        if transport != "tcp":
+            raise ValueError("pymodbus backend supports only the tcp transport")
+        super().__init__(host=host, port=port, data_broker=data_broker, framing=framing,
+                         datastore=datastore, unit_base=unit_base)
+        self.registers = registers
+        self._loop = None
+        self._server = None
+
+    def stop(self):
+        """Остановка сервера"""
+        self.running = False
+        if self._loop and self._server:
+            try:
+                asyncio.run_coroutine_threadsafe(self._server.shutdown(), self._loop)
+            except RuntimeError:
+                pass
+
+    def _run_server(self):
+        self._loop = asyncio.new_event_loop()
+        try:
+            self._loop.run_until_complete(self._serve())
+        except Exception as e:
+            print(f"[SERVER] pymodbus server error: {e}")
+        finally:
+            self._loop.close()
+
+    async def _serve(self):
+        device = ModbusDeviceContext(hr=ModbusSequentialDataBlock(1, [0] * self.registers))
+        self._server = ModbusTcpServer(
+            ModbusServerContext(device, single=True),
+            framer=_FRAMERS[self.framing],
+            address=(self.host, self.port),
+            trace_pdu=self._trace_pdu
+        )
+        print(f"[SERVER] pymodbus {self.framing.upper()} Server listening on {self.host}:{self.port}")
+
+        watcher = asyncio.ensure_future(self._watch_connections())
+        try:
+            await self._server.serve_forever()
+        finally:
+            watcher.cancel()
+
+    def _trace_pdu(self, sending, pdu):
+        if not sending:
+            self.total_packets += 1
+            self._packets_counter += 1
+        return pdu
+
+    async def _watch_connections(self):
+        while self.running:
+            self.active_clients = len(getattr(self._server, "active_connections", {}))
+            await asyncio.sleep(0.5)
+
+
+class PymodbusClientWorker(ModbusClientWorker):
+    """
+    Клиент на AsyncModbusTcpClient с теми же метриками, состояниями, backoff,
+    churn и окном pipelining, что и ModbusClientWorker.
+
+    Запись запросов выполняет pymodbus, поэтому объединения записей нет
+    (coalesced_writes всегда 0), а сам клиент pymodbus может сериализовать
+    запросы внутри — окно тогда ограничивает очередь ожидающих запросов.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if self.transport != "tcp":
+            raise ValueError("pymodbus backend supports only the tcp transport")
+
+    def _run(self):
+        try:
+            asyncio.run(self._main())
+        finally:
+            self.state = self.STATE_STOPPED
+
+    async def _main(self):
+        attempt = 0
+        while self.running:
+            client = await self._async_connect()
+            if client is None:
+                attempt += 1
+                await self._async_backoff(attempt)
+                continue
+
+            received_before = self.received_packets
+            churned = False
+            try:
+                churned = await self._async_session(client)
+            except Exception:
+                pass
+            finally:
+                client.close()
+                self._disconnect()
+
+            # Как в ModbusClientWorker: сброс только после сессии с ответами
+            if self.received_packets > received_before:
+                attempt = 0
+            if self.running and not churned:
+                attempt += 1
+                await self._async_backoff(attempt)
+
+    async def _async_connect(self):
+        self.state = self.STATE_CONNECTING
+        client = AsyncModbusTcpClient(
+            self.host, port=self.port, framer=_FRAMERS[self.framing],
+            timeout=self.response_timeout, retries=0, reconnect_delay=0
+        )
+        started = time.perf_counter()
+        try:
+            connected = await asyncio.wait_for(client.connect(), self.connect_timeout)
+        except Exception:
+            connected = False
+        if not connected or not self.running:
+            client.close()
+            if self.running:
+                self.connect_failures += 1
+            return None
+
+        self._record_connect(time.perf_counter() - started)
+        return client
+
+    async def _async_backoff(self, attempt):
+        if not self.running:
+            return
+        self.state = self.STATE_BACKOFF
+        wake_at = time.time() + self._backoff_delay(attempt)
+        while self.running and time.time() < wake_at:
+            await asyncio.sleep(min(0.05, wake_at - time.time()))
+
+    async def _async_session(self, client):
+        """Обмен по установленному соединению; True — плановое закрытие в режиме churn"""
+        session_start = time.time()
+        next_send = session_start
+        self._broken = False
+        tasks = set()
+        try:
+            while self.running:
+                now = time.time()
+                if self.churn_interval and now - session_start >= self.churn_interval:
+                    # Плановое закрытие: дождаться ответов на уже отправленные запросы
+                    if tasks:
+                        await asyncio.wait(set(tasks), timeout=self.response_timeout)
+                    self._due = 0
+                    return True
+                if self._broken:
+                    raise ConnectionError("connection lost")
+
+                if now >= next_send:
+                    next_send = self._queue_due(now, next_send)
+
+                window = self.pipeline_window
+                while self._due and (not window or len(self._pending) < window):
+                    self._due -= 1
+                    task = asyncio.ensure_future(self._request(client))
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+
+                await asyncio.sleep(max(0.0, min(0.01, next_send - time.time())))
+            return False
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _request(self, client):
+        self._transaction_id = (self._transaction_id + 1) & 0xFFFF
+        transaction_id = self._transaction_id
+        sent_at = time.perf_counter()
+        self._pending[transaction_id] = sent_at
+        self.sent_packets += 1
+        self.total_sent_packets += 1
+        if len(self._pending) > self.max_in_flight:
+            self.max_in_flight = len(self._pending)
+
+        try:
+            response = await client.read_holding_registers(
+                random.randint(0, 50), count=random.randint(1, 5), **{_UNIT_KWARG: random.choice(self.unit_ids)}
+            )
+        except ConnectionException:
+            self.errors += 1
+            self._broken = True
+        except ModbusIOException:
+            self.timeouts += 1
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            self.errors += 1
+        else:
+            self.received_packets += 1
+            if response.isError():
+                self.errors += 1
+            else:
+                self._latencies.append(time.perf_counter() - sent_at)
+        finally:
+            self._pending.pop(transaction_id, None)
@@ -0,0 +1,196 @@
+# modules/rtu_module.py
+import os
+import tty
+
+
+# -----------------------------------------------------
+# CRC16 (Modbus, полином 0xA001) — табличный
+# -----------------------------------------------------
+
+def _build_crc_table():
+    table = []
+    for byte in range(256):
+        crc = byte
+        for _ in range(8):
+            crc = (crc >> 1) ^ 0xA001 if crc & 1 else crc >> 1
+        table.append(crc)
+    return tuple(table)
+
+
+CRC16_TABLE = _build_crc_table()
+
+
+def crc16(data, crc=0xFFFF):
+    """CRC16/MODBUS; для кадра вместе с его CRC (little-endian) результат равен 0"""
+    table = CRC16_TABLE
+    for byte in data:
+        crc = (crc >> 8) ^ table[(crc ^ byte) & 0xFF]
+    return crc
+
+
+def crc16_batch(frames):
+    """CRC16 для списка буферов за один вызов"""
+    table = CRC16_TABLE
+    result = []
+    append = result.append
+    for data in frames:
+        crc = 0xFFFF
+        for byte in data:
+            crc = (crc >> 8) ^ table[(crc ^ byte) & 0xFF]
+        append(crc)
+    return result
+
+
+def validate_frames(frames):
+    """Проверка CRC у списка RTU-кадров (с CRC в конце): список bool"""
+    return [crc == 0 for crc in crc16_batch(frames)]
+
+
+def build_rtu_frame(unit_id: int, pdu: bytes) -> bytes:
+    frame = bytes([unit_id]) + pdu
+    return frame + crc16(frame).to_bytes(2, "little")
+
+
+# -----------------------------------------------------
+# Длина кадра по правилам кодов функций (без межсимвольных таймингов)
+# -----------------------------------------------------
+
+# Фиксированная длина кадра целиком (unit + fc + данные + CRC)
+_REQUEST_FIXED = {1: 8, 2: 8, 3: 8, 4: 8, 5: 8, 6: 8, 7: 4, 8: 8, 11: 4, 12: 4, 17: 4, 22: 10, 24: 6}
+_RESPONSE_FIXED = {5: 8, 6: 8, 7: 5, 8: 8, 11: 8, 15: 8, 16: 8, 22: 10}
+
+# Длина по полю byte count: смещение поля -> длина = смещение + 1 + byte_count + 2
+_REQUEST_BYTE_COUNT = {15: 6, 16: 6, 23: 10}
+_RESPONSE_BYTE_COUNT = {1: 2, 2: 2, 3: 2, 4: 2, 12: 2, 17: 2, 23: 2}
+
+NEED_MORE = 0
+UNKNOWN_FUNCTION = -1
+
+
+def rtu_frame_length(buf, offset=0, request=True):
+    """
+    Ожидаемая длина RTU-кадра, начинающегося в buf[offset].
+    NEED_MORE — данных пока недостаточно, UNKNOWN_FUNCTION — код функции неизвестен.
+    """
+    available = len(buf) - offset
+    if available < 2:
+        return NEED_MORE
+    function_code = buf[offset + 1]
+
+    if request:
+        fixed, by_count = _REQUEST_FIXED, _REQUEST_BYTE_COUNT
+    else:
+        if function_code & 0x80:
+            return 5
+        fixed, by_count = _RESPONSE_FIXED, _RESPONSE_BYTE_COUNT
+        if function_code == 24:
+            # FIFO: byte count занимает 2 байта
+            if available < 4:
+                return NEED_MORE
+            return 4 + int.from_bytes(buf[offset + 2:offset + 4], "big") + 2
+
+    length = fixed.get(function_code)
+    if length is not None:
+        return length
+
+    count_offset = by_count.get(function_code)
+    if count_offset is None:
+        return UNKNOWN_FUNCTION
+    if available <= count_offset:
+        return NEED_MORE
+    return count_offset + 1 + buf[offset + count_offset] + 2
+
+
+class RTUDeframer:
+    """
+    Выделение RTU-кадров из потока байт по правилам длины кодов функций.
+    Кадр с неверным CRC или неизвестным кодом функции сдвигает поток на один
+    байт (ресинхронизация), такие события считаются в crc_errors/resyncs.
+    """
+
+    def __init__(self, request=True):
+        self.request = request
+        self.buffer = b""
+        self.crc_errors = 0
+        self.resyncs = 0
+
+    def feed(self, data: bytes):
+        buf = self.buffer + data if self.buffer else data
+        frames = []
+        offset = 0
+        size = len(buf)
+        request = self.request
+        table = CRC16_TABLE
+
+        while size - offset >= 4:
+            length = rtu_frame_length(buf, offset, request)
+            if length == NEED_MORE:
+                break
+            if length == UNKNOWN_FUNCTION:
+                self.resyncs += 1
+                offset += 1
+                continue
+            if size - offset < length:
+                break
+
+            crc = 0xFFFF
+            for byte in buf[offset:offset + length]:
+                crc = (crc >> 8) ^ table[(crc ^ byte) & 0xFF]
+            if crc:
+                self.crc_errors += 1
+                offset += 1
+                continue
+
+            frames.append(buf[offset:offset + length])
+            offset += length
+
+        self.buffer = buf[offset:]
+        return frames
+
+
+# -----------------------------------------------------
+# Псевдотерминал как последовательный порт
+# -----------------------------------------------------
+
+class SerialStream:
+    """Файловый дескриптор tty с интерфейсом сокета: recv / sendall / close / fileno"""
+
+    def __init__(self, fd):
+        self.fd = fd
+
+    def fileno(self):
+        return self.fd
+
+    def recv(self, size):
+        return os.read(self.fd, size)
+
+    def sendall(self, data):
+        view = memoryview(data)
+        while view:
+            written = os.write(self.fd, view)
+            view = view[written:]
+
+    def close(self):
+        if self.fd >= 0:
+            try:
+                os.close(self.fd)
+            finally:
+                self.fd = -1
+
+
+def open_pty():
+    """Создать пару pty в raw-режиме: (master_fd, slave_fd, путь к slave-устройству)"""
+    master_fd, slave_fd = os.openpty()
+    tty.setraw(slave_fd)
+    return master_fd, slave_fd, os.ttyname(slave_fd)
+
+
+def open_serial(path):
+    """Открыть tty-устройство (например, slave-сторону pty сервера) в raw-режиме"""
+    fd = os.open(path, os.O_RDWR | os.O_NOCTTY)
+    try:
+        tty.setraw(fd)
+    except Exception:
+        os.close(fd)
+        raise
+    return SerialStream(fd)
@@ -0,0 +1,197 @@
+# modules/scheduler.py
+import time
+import threading
+
+
+class Timer:
+    """
+    Дескриптор запланированного действия. Отмена ленивая: таймер помечается
+    и выбрасывается из колеса, когда до него дойдёт очередь.
+    """
+
+    __slots__ = ("deadline", "interval", "callback", "args", "cancelled")
+
+    def __init__(self, deadline, interval, callback, args):
+        self.deadline = deadline      # тик срабатывания
+        self.interval = interval      # период в тиках (0 — однократный)
+        self.callback = callback
+        self.args = args
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class TimerWheel:
+    """
+    Иерархическое колесо таймеров: один поток обслуживает все действия атак.
+
+    Уровень 0 — 256 слотов по одному тику, уровни 1..3 — по 64 слота,
+    каждый следующий в 64 раза крупнее. Вставка и срабатывание — O(1),
+    поток спит до ближайшего непустого слота (или до границы каскада),
+    а при отсутствии таймеров ждёт без таймаута.
+    """
+
+    LEVEL0_BITS = 8
+    LEVEL_BITS = 6
+    LEVELS = 4
+
+    def __init__(self, tick_ms=1):
+        self.tick = tick_ms / 1000.0
+        self._level0_size = 1 << self.LEVEL0_BITS
+        self._level_size = 1 << self.LEVEL_BITS
+        self._shifts = [self.LEVEL0_BITS + self.LEVEL_BITS * (lvl - 1) for lvl in range(1, self.LEVELS)]
+        self._max_span = 1 << (self.LEVEL0_BITS + self.LEVEL_BITS * (self.LEVELS - 1))
+
+        self._wheels = [[[] for _ in range(self._level0_size)]]
+        for _ in range(1, self.LEVELS):
+            self._wheels.append([[] for _ in range(self._level_size)])
+
+        self._cond = threading.Condition()
+        self._origin = time.monotonic()
+        self._current = 0          # последний обработанный тик
+        self._count = 0            # таймеров в колесе (включая отменённые)
+        self.running = False
+        self.thread = None
+
+    # -----------------------------------------------------
+    # PUBLIC API
+    # -----------------------------------------------------
+
+    def start(self):
+        with self._cond:
+            if self.running:
+                return
+            self.running = True
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        with self._cond:
+            self.running = False
+            self._cond.notify()
+
+    def now(self):
+        """Время планировщика в секундах"""
+        return time.monotonic() - self._origin
+
+    def call_later(self, delay, callback, *args):
+        """Однократный вызов callback(*args) через delay секунд"""
+        return self._add(delay, 0, callback, args)
+
+    def call_every(self, interval, callback, *args, first_delay=None):
+        """Периодический вызов callback(*args) каждые interval секунд"""
+        ticks = max(1, int(round(interval / self.tick)))
+        if first_delay is None:
+            first_delay = interval
+        return self._add(first_delay, ticks, callback, args)
+
+    def pending(self):
+        with self._cond:
+            return self._count
+
+    # -----------------------------------------------------
+    # INTERNAL
+    # -----------------------------------------------------
+
+    def _now_tick(self):
+        return int(self.now() / self.tick)
+
+    def _add(self, delay, interval_ticks, callback, args):
+        with self._cond:
+            if self._count == 0:
+                # Колесо пустое — можно безопасно «перемотать» время
+                self._current = max(self._current, self._now_tick())
+            deadline = max(self._current + 1, int(round((self.now() + delay) / self.tick)))
+            timer = Timer(deadline, interval_ticks, callback, args)
+            self._insert(timer)
+            self._cond.notify()
+        return timer
+
+    def _insert(self, timer):
+        delta = timer.deadline - self._current
+        if delta < 0:
+            timer.deadline = self._current
+            delta = 0
+        # delta == 0 бывает только при каскаде на границе: таймер попадает
+        # в текущий слот уровня 0, который _advance обработает сразу после
+
+        if delta < self._level0_size:
+            self._wheels[0][timer.deadline & (self._level0_size - 1)].append(timer)
+        else:
+            placed = self._current + min(delta, self._max_span - 1)
+            for level, shift in enumerate(self._shifts, start=1):
+                if delta < (1 << (shift + self.LEVEL_BITS)) or level == self.LEVELS - 1:
+                    self._wheels[level][(placed >> shift) & (self._level_size - 1)].append(timer)
+                    break
+        self._count += 1
+
+    def _cascade(self, tick):
+        """Перераспределить таймеры старших уровней при переполнении младшего"""
+        for level, shift in enumerate(self._shifts, start=1):
+            index = (tick >> shift) & (self._level_size - 1)
+            slot = self._wheels[level][index]
+            self._wheels[level][index] = []
+            self._count -= len(slot)
+            for timer in slot:
+                if not timer.cancelled:
+                    self._insert(timer)
+            if index != 0:
+                break
+
+    def _next_event_tick(self):
+        """Ближайший тик с непустым слотом уровня 0 либо граница каскада"""
+        mask = self._level0_size - 1
+        boundary = (self._current | mask) + 1
+        level0 = self._wheels[0]
+        for tick in range(self._current + 1, boundary):
+            if level0[tick & mask]:
+                return tick
+        return boundary
+
+    def _advance(self, target):
+        """Обработать тики до target включительно, вернуть сработавшие таймеры"""
+        expired = []
+        mask = self._level0_size - 1
+        while self._current < target:
+            tick = min(self._next_event_tick(), target)
+            self._current = tick
+            if tick & mask == 0:
+                self._cascade(tick)
+            slot = self._wheels[0][tick & mask]
+            if slot:
+                self._wheels[0][tick & mask] = []
+                self._count -= len(slot)
+                for timer in slot:
+                    if timer.cancelled:
+                        continue
+                    expired.append(timer)
+                    if timer.interval:
+                        timer.deadline += timer.interval
+                        self._insert(timer)
+        return expired
+
+    def _run(self):
+        while True:
+            with self._cond:
+                if not self.running:
+                    return
+                if self._count == 0:
+                    self._cond.wait()
+                    continue
+
+                now_tick = self._now_tick()
+                next_tick = self._next_event_tick()
+                if next_tick > now_tick:
+                    self._cond.wait((next_tick * self.tick) - self.now())
+                    continue
+
+                expired = self._advance(now_tick)
+
+            for timer in expired:
+                if timer.cancelled:
+                    continue
+                try:
+                    timer.callback(*timer.args)
+                except Exception as e:
+                    print(f"[Scheduler] ERROR in {getattr(timer.callback, '__name__', timer.callback)}: {e}")
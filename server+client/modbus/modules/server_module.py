@@ -1,18 +1,62 @@
+import os
 import socket
+import struct
 import threading
 import time
 
+from modules.rtu_module import RTUDeframer, SerialStream, build_rtu_frame, open_pty
+from modules.datastore_module import (
+    GatewayDataStore, COILS, DISCRETE_INPUTS, HOLDING_REGISTERS, INPUT_REGISTERS, ADDRESS_SPACE
+)
+
+# Коды исключений Modbus
+ILLEGAL_FUNCTION = 0x01
+ILLEGAL_DATA_ADDRESS = 0x02
+ILLEGAL_DATA_VALUE = 0x03
+GATEWAY_TARGET_FAILED = 0x0B
+
+_READ_TABLES = {1: COILS, 2: DISCRETE_INPUTS, 3: HOLDING_REGISTERS, 4: INPUT_REGISTERS}
+
 
 class ModbusTCPServer:
-    def __init__(self, host="127.0.0.1", port=15020, data_broker=None):
+    """
+    framing: "mbap" — Modbus TCP, "rtu" — RTU-кадры (с CRC) поверх TCP.
+    transport: "tcp" — сокет, "pty" — последовательный порт на псевдотерминале
+    (всегда RTU); путь к устройству для клиента — serial_port.
+
+    Запросы маршрутизируются по unit id в datastore (GatewayDataStore):
+    адрес юнита = unit_base + unit id, так что несколько серверов могут
+    делить одно хранилище шлюза. По умолчанию — единственный юнит 1.
+    """
+
+    def __init__(self, host="127.0.0.1", port=15020, data_broker=None, framing="mbap", transport="tcp",
+                 datastore=None, unit_base=0):
+        if framing not in ("mbap", "rtu"):
+            raise ValueError(f"Unknown framing: {framing}")
+        if transport not in ("tcp", "pty"):
+            raise ValueError(f"Unknown transport: {transport}")
         self.host = host
         self.port = port
         self.data_broker = data_broker
+        self.transport = transport
+        self.framing = "rtu" if transport == "pty" else framing
+        self.crc_errors = 0
+        if datastore is None:
+            datastore = GatewayDataStore()
+            datastore.add_unit(unit_base + 1)
+        self.datastore = datastore
+        self.unit_base = unit_base
         self.server_socket = None
+        self.serial_port = None
+        self._pty = None
+        if transport == "pty":
+            master_fd, slave_fd, self.serial_port = open_pty()
+            self._pty = (master_fd, slave_fd)
         self.running = False
         self.active_clients = 0
         self.total_packets = 0
         self.packets_per_sec = 0
+        self.packets_per_sec_window = None   # (начало, конец) интервала, за который посчитан packets_per_sec
         self._last_second = time.time()
         self._packets_counter = 0
 
@@ -37,12 +81,16 @@ class ModbusTCPServer:
 
     def _run_server(self):
         """Основной цикл TCP сервера"""
+        if self.transport == "pty":
+            self._run_serial()
+            return
+
         self.server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         self.server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
         self.server_socket.bind((self.host, self.port))
         self.server_socket.listen(20)
 
-        print(f"[SERVER] Modbus TCP Server listening on {self.host}:{self.port}")
+        print(f"[SERVER] Modbus {self.framing.upper()} Server listening on {self.host}:{self.port}")
 
         while self.running:
             try:
@@ -57,18 +105,38 @@ class ModbusTCPServer:
             except OSError:
                 break
 
+    def _run_serial(self):
+        """Последовательный порт: одно «соединение» на master-стороне pty"""
+        print(f"[SERVER] Modbus RTU Server on serial port {self.serial_port}")
+        self.active_clients += 1
+        # Свой дескриптор master не закрываем: pty живёт столько же, сколько сервер
+        self._handle_client(SerialStream(os.dup(self._pty[0])), self.serial_port)
+
     def _handle_client(self, client_socket, addr):
         """Обработка клиентских пакетов"""
+        buffer = b""
+        deframer = RTUDeframer(request=True) if self.framing == "rtu" else None
         while self.running:
             try:
-                data = client_socket.recv(1024)
+                data = client_socket.recv(4096)
                 if not data:
                     break
-                self.total_packets += 1
-                self._packets_counter += 1
+                # Клиент может прислать несколько запросов одной записью (pipelining)
+                if deframer:
+                    crc_errors = deframer.crc_errors
+                    frames = deframer.feed(data)
+                    self.crc_errors += deframer.crc_errors - crc_errors
+                    respond = self._create_rtu_response
+                else:
+                    frames, buffer = self._split_frames(buffer + data)
+                    respond = self._create_modbus_response
+                if not frames:
+                    continue
+                self.total_packets += len(frames)
+                self._packets_counter += len(frames)
                 if self.data_broker:
                     self.data_broker.update_packets(self._packets_counter)
-                response = self._create_modbus_echo_response(data)
+                response = b"".join(respond(frame) for frame in frames)
                 client_socket.sendall(response)
             except:
                 break
@@ -77,15 +145,94 @@ class ModbusTCPServer:
         self.active_clients -= 1
         print(f"[SERVER] Client disconnected: {addr}")
 
-    def _create_modbus_echo_response(self, request: bytes) -> bytes:
+    @staticmethod
+    def _split_frames(buffer: bytes):
+        """Разделить поток на полные MBAP-кадры, вернуть (кадры, остаток)"""
+        frames = []
+        offset = 0
+        while len(buffer) - offset >= 7:
+            length = int.from_bytes(buffer[offset + 4:offset + 6], "big")
+            frame_end = offset + 6 + length
+            if frame_end > len(buffer):
+                break
+            frames.append(buffer[offset:frame_end])
+            offset = frame_end
+        return frames, buffer[offset:]
+
+    def _create_modbus_response(self, request: bytes) -> bytes:
         if len(request) < 8:
             return b""
-        transaction_id = request[0:2]
-        protocol_id = request[2:4]
-        length = request[4:6]
-        unit_id = request[6:7]
-        pdu = request[7:]
-        return transaction_id + protocol_id + length + unit_id + pdu
+        pdu = self._process_pdu(request[6], request[7:])
+        return request[0:4] + struct.pack(">HB", len(pdu) + 1, request[6]) + pdu
+
+    def _create_rtu_response(self, request: bytes) -> bytes:
+        unit_id = request[0]
+        pdu = self._process_pdu(unit_id, request[1:-2])
+        if unit_id == 0:
+            # Широковещательный запрос RTU: выполняется, но без ответа
+            return b""
+        return build_rtu_frame(unit_id, pdu)
+
+    def _process_pdu(self, unit_id: int, pdu: bytes) -> bytes:
+        """Выполнить PDU над юнитом из datastore, вернуть PDU ответа"""
+        function_code = pdu[0]
+        if function_code not in _READ_TABLES and function_code not in (5, 6, 15, 16):
+            return bytes([function_code | 0x80, ILLEGAL_FUNCTION])
+        unit = self.datastore.get_unit(self.unit_base + unit_id)
+        if unit is None:
+            return bytes([function_code | 0x80, GATEWAY_TARGET_FAILED])
+        if len(pdu) < 5:
+            return bytes([function_code | 0x80, ILLEGAL_DATA_VALUE])
+
+        address, value = struct.unpack_from(">HH", pdu, 1)
+
+        if function_code in _READ_TABLES:
+            limit = 2000 if function_code <= 2 else 125
+            if not 1 <= value <= limit:
+                return bytes([function_code | 0x80, ILLEGAL_DATA_VALUE])
+            if address + value > ADDRESS_SPACE:
+                return bytes([function_code | 0x80, ILLEGAL_DATA_ADDRESS])
+            values = unit.get_values(_READ_TABLES[function_code], address, value)
+            if function_code <= 2:
+                data = self._pack_bits(values)
+            else:
+                data = struct.pack(f">{value}H", *values)
+            return bytes([function_code, len(data)]) + data
+
+        if function_code == 5:
+            if value not in (0x0000, 0xFF00):
+                return bytes([function_code | 0x80, ILLEGAL_DATA_VALUE])
+            unit.set_values(COILS, address, [1 if value else 0])
+            return pdu[:5]
+
+        if function_code == 6:
+            unit.set_values(HOLDING_REGISTERS, address, [value])
+            return pdu[:5]
+
+        if function_code in (15, 16):
+            data = pdu[6:6 + pdu[5]] if len(pdu) > 5 else b""
+            if function_code == 15:
+                if not 1 <= value <= 1968 or len(data) < (value + 7) // 8:
+                    return bytes([function_code | 0x80, ILLEGAL_DATA_VALUE])
+                values = [(data[i >> 3] >> (i & 7)) & 1 for i in range(value)]
+                table = COILS
+            else:
+                if not 1 <= value <= 123 or len(data) < value * 2:
+                    return bytes([function_code | 0x80, ILLEGAL_DATA_VALUE])
+                values = list(struct.unpack_from(f">{value}H", data))
+                table = HOLDING_REGISTERS
+            if address + value > ADDRESS_SPACE:
+                return bytes([function_code | 0x80, ILLEGAL_DATA_ADDRESS])
+            unit.set_values(table, address, values)
+            return pdu[:5]
+
+    @staticmethod
+    def _pack_bits(values):
+        data = bytearray((len(values) + 7) // 8)
+        for i, bit in enumerate(values):
+            if bit:
+                data[i >> 3] |= 1 << (i & 7)
+        return bytes(data)
 
     def _monitor_packets(self):
         """Подсчёт пакетов в секунду и передача в брокер"""
@@ -96,6 +243,7 @@ class ModbusTCPServer:
             if now - last_stat_reset >= 1:
                 packets_now = self._packets_counter
                 self.packets_per_sec = packets_now
+                self.packets_per_sec_window = (last_stat_reset, now)
                 self._packets_counter = 0
                 last_stat_reset = now
                 if self.data_broker:
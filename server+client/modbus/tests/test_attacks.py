@@ -0,0 +1,85 @@
+# tests/test_attacks.py
+import pytest
+
+from modules.attacks_module import AttackManager
+
+
+class _FakeClient:
+    def __init__(self, pps=10):
+        self.packets_per_second = pps
+        self.churn_interval = None
+        self.total_sent_packets = 0
+        self.errors = 0
+        self.timeouts = 0
+
+    def update_rate(self, pps):
+        self.packets_per_second = pps
+
+    def set_churn(self, churn_interval):
+        self.churn_interval = churn_interval or None
+
+    def drain_latencies(self):
+        return []
+
+
+class _FakeClientManager:
+    def __init__(self, count):
+        self.clients = [_FakeClient() for _ in range(count)]
+
+    def set_client_rate(self, idx, pps):
+        self.clients[idx].update_rate(pps)
+
+    def set_client_churn(self, idx, churn_interval):
+        self.clients[idx].set_churn(churn_interval)
+
+
+class _FakeServer:
+    packets_per_sec = 0
+
+
+@pytest.fixture
+def manager(tmp_path):
+    manager = AttackManager(_FakeServer(), None, _FakeClientManager(4))
+    manager.impact.reports_dir = str(tmp_path)
+    yield manager
+    manager.impact.stop()
+    manager.scheduler.stop()
+
+
+def _campaign(manager):
+    """Сценарий, шаги которого тест выполняет сам (время шагов далеко в будущем)"""
+    return manager.run_campaign({"name": "test", "steps": [{"at": 3600, "action": "stop_all"}]})
+
+
+def test_campaign_stop_all_only_stops_its_own_attacks(manager):
+    mine = _campaign(manager)
+    other = _campaign(manager)
+    manager._run_campaign_step(mine, {"at": 0, "action": "attack", "clients": [0], "attack_type": "Slowloris",
+                                      "duration": None})
+    manager._run_campaign_step(other, {"at": 0, "action": "attack", "clients": [1], "attack_type": "Slowloris",
+                                       "duration": None})
+    assert manager.start_attack_for_client(2, "SYN Flood")
+
+    manager._run_campaign_step(mine, {"at": 0, "action": "stop_all"})
+
+    assert sorted(a["client_index"] for a in manager.list_attacks()) == [1, 2]
+
+
+def test_stop_campaign_restores_rates_and_churn(manager):
+    clients = manager.client_manager.clients
+    clients[3].set_churn(5)
+    campaign_id = _campaign(manager)
+
+    manager._run_campaign_step(campaign_id, {"at": 0, "action": "set_rate", "clients": [0, 1], "pps": 500})
+    manager._run_campaign_step(campaign_id, {"at": 0, "action": "set_churn", "clients": [1, 3], "interval": 1})
+    manager._run_campaign_step(campaign_id, {"at": 0, "action": "ramp", "clients": [2], "pps": 900,
+                                             "over": 3600, "step": 60})
+    manager._run_campaign_step(campaign_id, {"at": 0, "action": "set_rate", "clients": [0], "pps": 700})
+    assert [c.packets_per_second for c in clients] == [700, 500, 10, 10]
+    assert [c.churn_interval for c in clients] == [None, 1, None, 1]
+
+    assert manager.stop_campaign(campaign_id)
+
+    assert [c.packets_per_second for c in clients] == [10, 10, 10, 10]
+    assert [c.churn_interval for c in clients] == [None, None, None, 5]
+    assert manager.list_campaigns() == []
@@ -0,0 +1,110 @@
+# tests/test_backend.py
+import socket
+import time
+
+import pytest
+
+from modules.backend_module import BACKENDS, NativeBackend, PymodbusBackend, get_backend
+from modules.client_module import ModbusClientWorker
+from modules.datastore_module import GatewayDataStore
+from modules.server_module import ModbusTCPServer
+
+
+def _free_port():
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _wait_listening(port, timeout=5.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.5).close()
+            return
+        except OSError:
+            time.sleep(0.05)
+    raise AssertionError(f"server did not start on port {port}")
+
+
+def _run_client(worker, duration=1.0):
+    worker.start()
+    try:
+        time.sleep(duration)
+        return worker.received_packets, worker.errors, worker.timeouts
+    finally:
+        worker.stop()
+        worker.thread.join(2.0)
+
+
+def test_get_backend_by_name_and_instance():
+    assert set(BACKENDS) == {"native", "pymodbus"}
+    assert isinstance(get_backend(), NativeBackend)
+    assert isinstance(get_backend("pymodbus"), PymodbusBackend)
+    backend = NativeBackend()
+    assert get_backend(backend) is backend
+
+
+def test_get_backend_unknown_name():
+    with pytest.raises(ValueError, match="Unknown backend"):
+        get_backend("twisted")
+
+
+def test_native_backend_creates_native_objects():
+    backend = get_backend("native")
+    assert type(backend.create_server(port=_free_port())) is ModbusTCPServer
+    assert type(backend.create_client(packets_per_second=5)) is ModbusClientWorker
+
+
+@pytest.fixture
+def gateway():
+    """Нативный сервер, у которого есть только юнит 7"""
+    pytest.importorskip("pymodbus")
+    store = GatewayDataStore()
+    store.add_unit(7)
+    port = _free_port()
+    server = ModbusTCPServer(port=port, datastore=store)
+    server.start()
+    _wait_listening(port)
+    yield port
+    server.stop()
+
+
+def test_pymodbus_client_against_native_server_honours_unit_id(gateway):
+    backend = get_backend("pymodbus")
+
+    received, errors, timeouts = _run_client(
+        backend.create_client(port=gateway, packets_per_second=100, pipeline_window=4, unit_ids=[7])
+    )
+    assert received > 0 and errors == 0 and timeouts == 0
+
+    # Юнита 8 на шлюзе нет: каждый ответ — исключение 0x0B
+    received, errors, _ = _run_client(
+        backend.create_client(port=gateway, packets_per_second=100, pipeline_window=4, unit_ids=[8])
+    )
+    assert received > 0 and errors == received
+
+
+def test_native_client_against_pymodbus_server():
+    pytest.importorskip("pymodbus")
+    port = _free_port()
+    server = get_backend("pymodbus").create_server(port=port)
+    server.start()
+    try:
+        _wait_listening(port)
+        received, errors, timeouts = _run_client(
+            ModbusClientWorker(port=port, packets_per_second=100, pipeline_window=4)
+        )
+        assert received > 0 and errors == 0 and timeouts == 0
+        assert server.total_packets >= received
+    finally:
+        server.stop()
+
+
+def test_pymodbus_backend_rejects_pty_transport():
+    pytest.importorskip("pymodbus")
+    backend = get_backend("pymodbus")
+    with pytest.raises(ValueError):
+        backend.create_server(port=_free_port(), transport="pty")
+    with pytest.raises(ValueError):
+        backend.create_client(transport="pty")
@@ -0,0 +1,90 @@
+# tests/test_campaign.py
+import json
+
+import pytest
+
+from modules.campaign_module import CampaignError, load_campaign, parse_clients
+
+
+@pytest.fixture
+def campaign_file(tmp_path):
+    def write(data):
+        path = tmp_path / "campaign.json"
+        path.write_text(json.dumps(data), encoding="utf-8")
+        return str(path)
+    return write
+
+
+@pytest.mark.parametrize("spec, expected", [
+    (5, [4]),
+    ("1-3", [0, 1, 2]),
+    ("1,3,7-9", [0, 2, 6, 7, 8]),
+    ([1, 2, "10-11"], [0, 1, 9, 10]),
+    ("2, 2, 1-2", [0, 1]),
+])
+def test_parse_clients(spec, expected):
+    assert parse_clients(spec) == expected
+
+
+@pytest.mark.parametrize("spec", ["", [], "0", "3-1", "a-b", "1,x", 1.5, None])
+def test_parse_clients_rejects_invalid(spec):
+    with pytest.raises(CampaignError):
+        parse_clients(spec)
+
+
+def test_load_campaign_sorts_steps_and_splits_total_pps(campaign_file):
+    campaign = load_campaign(campaign_file({
+        "name": "overload",
+        "steps": [
+            {"at": 60, "action": "ramp", "clients": "1-4", "total_pps": 1000, "over": 30},
+            {"at": 30, "action": "attack", "attack_type": "Slowloris", "clients": "1-2", "duration": 120},
+            {"at": 200, "action": "stop_all"},
+        ]
+    }))
+
+    assert campaign["name"] == "overload"
+    assert [s["at"] for s in campaign["steps"]] == [30, 60, 200]
+    attack, ramp, _ = campaign["steps"]
+    assert attack["clients"] == [0, 1]
+    assert attack["duration"] == 120
+    assert ramp["pps"] == 250
+    assert ramp["over"] == 30
+    assert ramp["step"] == 0.1
+
+
+def test_load_campaign_set_churn(campaign_file):
+    campaign = load_campaign(campaign_file([
+        {"at": 5, "action": "set_churn", "clients": "1-3", "interval": 2},
+        {"at": 9, "action": "set_churn", "clients": "1-3", "interval": 0},
+    ]))
+    assert [(s["clients"], s["interval"]) for s in campaign["steps"]] == [([0, 1, 2], 2.0), ([0, 1, 2], 0.0)]
+
+
+@pytest.mark.parametrize("step", [
+    {"action": "ramp", "clients": 1, "pps": 10, "step": 0},
+    {"action": "ramp", "clients": 1, "pps": 10, "step": -1},
+    {"action": "ramp", "clients": 1, "pps": 10, "over": -5},
+    {"action": "ramp", "clients": 1},
+    {"action": "ramp", "clients": "", "total_pps": 100},
+    {"action": "ramp", "clients": 1, "pps": "fast"},
+    {"action": "set_rate", "clients": 1},
+    {"action": "set_rate", "clients": 1, "pps": 0},
+    {"action": "set_churn", "clients": 1},
+    {"action": "set_churn", "clients": 1, "interval": -1},
+    {"action": "attack", "clients": 1, "attack_type": "Ping of Death"},
+    {"action": "attack", "clients": 1, "attack_type": "Slowloris", "duration": "long"},
+    {"action": "stop_all", "at": "soon"},
+    {"action": "stop_all", "at": -1},
+    {"action": "stop_all", "at": True},
+    {"action": "explode"},
+    "attack",
+])
+def test_load_campaign_rejects_invalid_steps(campaign_file, step):
+    with pytest.raises(CampaignError):
+        load_campaign(campaign_file([step]))
+
+
+@pytest.mark.parametrize("data", [5, "steps", {"steps": []}, {"name": "empty"}, []])
+def test_load_campaign_rejects_invalid_top_level(campaign_file, data):
+    with pytest.raises(CampaignError):
+        load_campaign(campaign_file(data))
@@ -0,0 +1,120 @@
+# tests/test_client.py
+import socket
+import struct
+import threading
+import time
+
+import pytest
+
+from modules.client_module import ModbusClientWorker
+from modules.server_module import ModbusTCPServer
+
+
+class _DroppingServer:
+    """TCP-сервер, который принимает соединение и закрывает его после replies ответов"""
+
+    def __init__(self, replies=0):
+        self.replies = replies
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.sock.bind(("127.0.0.1", 0))
+        self.sock.listen(16)
+        self.port = self.sock.getsockname()[1]
+        threading.Thread(target=self._serve, daemon=True).start()
+
+    def _serve(self):
+        while True:
+            try:
+                conn, _ = self.sock.accept()
+            except OSError:
+                return
+            try:
+                for _ in range(self.replies):
+                    request = conn.recv(12)
+                    if len(request) < 12:
+                        break
+                    transaction_id, _, _, unit_id = struct.unpack(">HHHB", request[:7])
+                    conn.sendall(struct.pack(">HHHBBBH", transaction_id, 0, 5, unit_id, 3, 2, 0))
+            finally:
+                conn.close()
+
+    def close(self):
+        self.sock.close()
+
+
+def _record_backoff(server, duration=0.5):
+    worker = ModbusClientWorker(port=server.port, packets_per_second=100)
+    attempts = []
+    worker._backoff_delay = lambda attempt: attempts.append(attempt) or 0.01
+    worker.start()
+    try:
+        time.sleep(duration)
+    finally:
+        worker.stop()
+        worker.thread.join(2.0)
+        server.close()
+    return worker, attempts
+
+
+def test_backoff_grows_when_server_drops_every_connection():
+    worker, attempts = _record_backoff(_DroppingServer(replies=0))
+
+    assert worker.received_packets == 0
+    assert len(attempts) >= 5
+    assert attempts == list(range(1, len(attempts) + 1))
+
+
+def test_backoff_resets_after_a_session_with_responses():
+    worker, attempts = _record_backoff(_DroppingServer(replies=1))
+
+    assert worker.received_packets >= 5
+    assert attempts and set(attempts) == {1}
+
+
+@pytest.mark.parametrize("attempt, ceiling", [(1, 0.2), (3, 0.8), (20, 10.0)])
+def test_backoff_delay_is_capped_full_jitter(attempt, ceiling):
+    worker = ModbusClientWorker()
+    delays = [worker._backoff_delay(attempt) for _ in range(200)]
+
+    assert all(0 <= d <= ceiling for d in delays)
+    assert max(delays) > ceiling / 2
+
+
+def test_latency_buffer_is_bounded_without_a_consumer():
+    worker = ModbusClientWorker()
+    for i in range(worker.LATENCY_BUFFER + 1000):
+        worker._latencies.append(i)
+
+    latencies = worker.drain_latencies()
+    assert len(latencies) == worker.LATENCY_BUFFER
+    assert latencies[-1] == worker.LATENCY_BUFFER + 999
+    assert worker.drain_latencies() == []
+
+
+def test_churn_reconnects_without_backoff_or_errors():
+    server = ModbusTCPServer(port=0)
+    server.start()
+    try:
+        deadline = time.time() + 2.0
+        while server.server_socket is None or server.server_socket.getsockname()[1] == 0:
+            assert time.time() < deadline
+            time.sleep(0.01)
+        port = server.server_socket.getsockname()[1]
+
+        worker = ModbusClientWorker(port=port, packets_per_second=500, pipeline_window=8, churn_interval=0.2)
+        attempts = []
+        worker._backoff_delay = lambda attempt: attempts.append(attempt) or 0.0
+        worker.start()
+        time.sleep(1.1)
+        worker.set_churn(None)
+        time.sleep(0.2)
+        connects = worker.connects
+        worker.stop()
+        worker.thread.join(2.0)
+    finally:
+        server.stop()
+
+    assert connects >= 4
+    assert attempts == []
+    assert worker.errors == 0 and worker.timeouts == 0
+    assert worker.received_packets > 300
@@ -0,0 +1,42 @@
+# tests/test_client_manager.py
+import sys
+import time
+
+import pytest
+
+from modules.client_manager import ClientManager
+from modules.server_module import ModbusTCPServer
+
+
+@pytest.fixture
+def pty_server():
+    if sys.platform == "win32":
+        pytest.skip("pty transport needs a POSIX system")
+    server = ModbusTCPServer(transport="pty")
+    server.start()
+    yield server
+    server.stop()
+
+
+def test_serial_port_allows_a_single_master(pty_server):
+    manager = ClientManager(transport="pty", serial_port=pty_server.serial_port)
+    try:
+        assert manager.add_client(200)
+        assert not manager.add_client(200)
+        assert len(manager.clients) == 1
+
+        time.sleep(1.5)
+        client = manager.clients[0]
+        assert client.connected
+        assert client.received_packets > 100
+        assert client.timeouts == 0
+        assert client.errors == 0
+        assert client.crc_errors == 0
+        assert client.sent_packets - client.received_packets <= 5
+    finally:
+        manager.stop_all()
+
+
+def test_tcp_transport_keeps_the_client_limit():
+    manager = ClientManager()
+    assert manager.max_clients == 10
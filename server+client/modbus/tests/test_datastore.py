@@ -0,0 +1,82 @@
+# tests/test_datastore.py
+from modules.datastore_module import (
+    COILS, HOLDING_REGISTERS, INPUT_REGISTERS, PAGE_SIZE, GatewayDataStore, UnitTemplate
+)
+
+
+def _store(units=3):
+    template = UnitTemplate("plc")
+    template.set_values(HOLDING_REGISTERS, 0, list(range(100, 100 + 2 * PAGE_SIZE)))
+    store = GatewayDataStore(default_template=template)
+    store.add_units(range(1, units + 1))
+    return store, template
+
+
+def test_units_share_template_pages_until_first_write():
+    store, template = _store()
+    first, second = store.get_unit(1), store.get_unit(2)
+
+    assert first.get_values(HOLDING_REGISTERS, 0, 3) == [100, 101, 102]
+    assert first.pages is None and second.pages is None
+    assert store.memory_stats()["dirty_units"] == 0
+
+
+def test_copy_on_write_isolates_units_and_template():
+    store, template = _store()
+    first, second = store.get_unit(1), store.get_unit(2)
+
+    first.set_values(HOLDING_REGISTERS, 1, [7])
+
+    assert first.get_values(HOLDING_REGISTERS, 0, 3) == [100, 7, 102]
+    assert second.get_values(HOLDING_REGISTERS, 0, 3) == [100, 101, 102]
+    assert template.get_values(HOLDING_REGISTERS, 0, 3) == [100, 101, 102]
+    # Скопирована только затронутая страница, остальные по-прежнему из шаблона
+    assert first.allocated_pages() == 1
+    assert first.get_values(HOLDING_REGISTERS, PAGE_SIZE, 2) == [100 + PAGE_SIZE, 101 + PAGE_SIZE]
+    assert store.memory_stats() == {
+        "units": 3, "dirty_units": 1, "own_pages": 1, "own_page_bytes": PAGE_SIZE * 2
+    }
+
+
+def test_write_across_page_boundary():
+    store, _ = _store()
+    unit = store.get_unit(3)
+    start = PAGE_SIZE - 3
+    values = list(range(1, 11))
+
+    unit.set_values(HOLDING_REGISTERS, start, values)
+
+    assert unit.allocated_pages() == 2
+    assert unit.get_values(HOLDING_REGISTERS, start - 1, 12) == [100 + start - 1] + values + [100 + start + 10]
+    assert store.get_unit(1).get_values(HOLDING_REGISTERS, start, 10) == list(range(100 + start, 110 + start))
+
+
+def test_write_at_the_end_of_the_address_space():
+    store, _ = _store()
+    unit = store.get_unit(1)
+
+    unit.set_values(INPUT_REGISTERS, 0xFFFE, [1, 2])
+
+    assert unit.get_values(INPUT_REGISTERS, 0xFFFC, 4) == [0, 0, 1, 2]
+
+
+def test_tables_are_independent():
+    store, _ = _store()
+    unit = store.get_unit(1)
+
+    unit.set_values(COILS, 0, [1, 1])
+
+    assert unit.get_values(COILS, 0, 3) == [1, 1, 0]
+    assert unit.get_values(HOLDING_REGISTERS, 0, 2) == [100, 101]
+
+
+def test_unknown_units_and_auto_create():
+    store, _ = _store()
+    assert store.get_unit(99) is None
+    assert store.remove_unit(3) and not store.remove_unit(3)
+    assert len(store) == 2
+
+    store.auto_create = True
+    unit = store.get_unit(99)
+    assert unit is not None and unit.get_values(HOLDING_REGISTERS, 0, 1) == [100]
+    assert len(store) == 3
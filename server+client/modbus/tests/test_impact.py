@@ -0,0 +1,209 @@
+# tests/test_impact.py
+import bisect
+import json
+import math
+import os
+
+import pytest
+
+from modules.impact_module import LATENCY_BUCKETS, ImpactMonitor, _percentile
+
+
+STARTED, STOPPED = 10.0, 15.0
+
+
+class _FakeTimer:
+    def cancel(self):
+        pass
+
+
+class _FakeScheduler:
+    def __init__(self):
+        self.calls = []
+
+    def call_every(self, interval, callback, *args, first_delay=None):
+        self.calls.append(("every", interval, callback, args))
+        return _FakeTimer()
+
+    def call_later(self, delay, callback, *args):
+        self.calls.append(("later", delay, callback, args))
+        return _FakeTimer()
+
+
+class _FakeClient:
+    def __init__(self):
+        self.total_sent_packets = 0
+        self.errors = 0
+        self.timeouts = 0
+        self.latencies = []
+
+    def drain_latencies(self):
+        latencies, self.latencies = self.latencies, []
+        return latencies
+
+
+class _FakeClientManager:
+    def __init__(self, clients):
+        self.clients = clients
+
+
+class _FakeServer:
+    packets_per_sec = 0
+    packets_per_sec_window = None
+
+
+def _histogram(latency, count):
+    histogram = [0] * (len(LATENCY_BUCKETS) + 1)
+    histogram[bisect.bisect_left(LATENCY_BUCKETS, latency)] = count
+    return histogram
+
+
+def _overlaps_attack(start, end):
+    return start < STOPPED and end > STARTED
+
+
+def _sample(end):
+    """Выборка за [end - 0.5, end]; секунды сервера — [k + 0.8, k + 1.8]"""
+    start = end - 0.5
+    server_end = math.floor(end - 0.8) + 0.8
+    server_start = server_end - 1
+    attacked = _overlaps_attack(start, end)
+    return {
+        "start": start,
+        "end": end,
+        "server_pps": 500 if _overlaps_attack(server_start, server_end) else 1000,
+        "server_start": server_start,
+        "server_end": server_end,
+        "latency_histogram": _histogram(0.010 if attacked else 0.001, 100),
+        "sent": 100,
+        "errors": 5 if attacked else 0,
+        "timeouts": 2 if attacked else 0,
+        "process_cpu_percent": 80.0 if attacked else 20.0,
+        "process_rss_bytes": 2000 if attacked else 1000
+    }
+
+
+@pytest.fixture
+def monitor(tmp_path):
+    monitor = ImpactMonitor(
+        _FakeServer(), _FakeClientManager([]), _FakeScheduler(), set,
+        baseline_seconds=10, recovery_seconds=30, reports_dir=str(tmp_path)
+    )
+    # Выборки не выровнены по началу/концу атаки: две из них пересекают границы
+    monitor.samples.extend(_sample(0.25 + 0.5 * k) for k in range(1, 91))
+    yield monitor
+    monitor.stop()
+
+
+def _bucket(latency):
+    return LATENCY_BUCKETS[bisect.bisect_left(LATENCY_BUCKETS, latency)]
+
+
+def test_percentile():
+    assert _percentile([0] * 10, 0.5) is None
+    histogram = [0] * (len(LATENCY_BUCKETS) + 1)
+    histogram[3] = 90
+    histogram[20] = 10
+    assert _percentile(histogram, 0.5) == LATENCY_BUCKETS[3]
+    assert _percentile(histogram, 0.9) == LATENCY_BUCKETS[3]
+    assert _percentile(histogram, 0.95) == LATENCY_BUCKETS[20]
+    histogram[-1] = 1000
+    assert _percentile(histogram, 0.99) == LATENCY_BUCKETS[-1]
+
+
+def test_windows_use_only_samples_entirely_inside(monitor):
+    baseline = monitor._summarize(STARTED - 10, STARTED)
+    during = monitor._summarize(STARTED, STOPPED)
+    recovery = monitor._summarize(STOPPED, STOPPED + 30)
+
+    assert (baseline["samples"], during["samples"], recovery["samples"]) == (19, 9, 59)
+
+    assert baseline["server_pps"] == 1000
+    assert during["server_pps"] == 500
+    assert recovery["server_pps"] == 1000
+
+    assert baseline["latency_p95"] == recovery["latency_p95"] == _bucket(0.001)
+    assert during["latency_p95"] == _bucket(0.010)
+    assert baseline["error_rate"] == recovery["error_rate"] == 0.0
+    assert during["error_rate"] == pytest.approx(0.05)
+    assert during["timeout_rate"] == pytest.approx(0.02)
+    assert during["process_cpu_percent"] == 80.0
+    assert baseline["process_rss_bytes"] == 1000
+
+
+def test_recovery_time_waits_for_a_server_second_after_the_stop(monitor):
+    baseline = monitor._summarize(STARTED - 10, STARTED)
+    # Первая выборка после остановки — [15.25, 15.75], но секунды сервера
+    # [13.8, 14.8] и [14.8, 15.8] ещё захватывают атаку; первая чистая — [15.8, 16.8]
+    assert monitor._recovery_time(baseline, STOPPED) == pytest.approx(2.25)
+
+
+def test_recovery_time_is_none_without_recovery(monitor):
+    baseline = monitor._summarize(STARTED - 10, STARTED)
+    with monitor.lock:
+        for s in monitor.samples:
+            if s["start"] >= STOPPED:
+                s["errors"] = 1
+    assert monitor._recovery_time(baseline, STOPPED) is None
+
+
+def test_finalize_builds_and_exports_the_report(monitor, tmp_path):
+    monitor.attack_started(7, "SYN Flood", 2)
+    monitor.tracked[7]["started"] = STARTED
+    monitor.tracked[7]["stopped"] = STOPPED
+
+    monitor._finalize(7)
+
+    report = monitor.get_report(7)
+    assert report["attack_type"] == "SYN Flood"
+    assert report["client_index"] == 2
+    assert report["duration"] == 5.0
+    assert report["impact"]["server_pps_ratio"] == 0.5
+    assert report["impact"]["latency_p95_ratio"] == pytest.approx(_bucket(0.010) / _bucket(0.001))
+    assert report["impact"]["error_rate_change"] == pytest.approx(0.05)
+    assert report["impact"]["process_cpu_percent_change"] == 60.0
+    assert report["recovery_time"] == pytest.approx(2.25)
+    assert monitor.list_reports() == [report]
+    assert 7 not in monitor.tracked
+
+    files = os.listdir(tmp_path)
+    assert len(files) == 1 and files[0].startswith("attack_7_syn_flood_")
+    with open(tmp_path / files[0], encoding="utf-8") as f:
+        assert json.load(f) == report
+
+
+def test_attack_stopped_schedules_finalize_through_the_job_queue(monitor):
+    monitor.attack_started(1, "Slowloris", 0)
+    monitor.attack_stopped(1)
+    monitor.attack_stopped(1)
+
+    later = [call for call in monitor.scheduler.calls if call[0] == "later"]
+    assert len(later) == 1
+    _, delay, callback, args = later[0]
+    assert delay == monitor.recovery_seconds
+    assert callback == monitor._jobs.put and args == ((monitor._finalize, 1),)
+
+
+def test_sample_skips_attacked_clients_and_chains_intervals():
+    clients = [_FakeClient(), _FakeClient()]
+    server = _FakeServer()
+    monitor = ImpactMonitor(server, _FakeClientManager(clients), _FakeScheduler(), lambda: {1})
+    try:
+        monitor._sample()
+        for client in clients:
+            client.total_sent_packets += 10
+            client.errors += 1
+            client.latencies = [0.001, 0.002]
+        server.packets_per_sec = 42
+        server.packets_per_sec_window = (100.0, 101.0)
+
+        monitor._sample()
+
+        first, second = list(monitor.samples)
+        assert second["start"] == first["end"]
+        assert (second["sent"], second["errors"], second["timeouts"]) == (10, 1, 0)
+        assert sum(second["latency_histogram"]) == 2
+        assert second["server_pps"] == 42
+        assert (second["server_start"], second["server_end"]) == (100.0, 101.0)
+    finally:
+        monitor.stop()
@@ -0,0 +1,148 @@
+# tests/test_pipeline.py
+import heapq
+import select
+import socket
+import struct
+import threading
+import time
+
+from modules.client_module import ModbusClientWorker
+from modules.server_module import ModbusTCPServer
+
+
+class _DelayedServer:
+    """
+    Loopback MBAP-сервер: на каждый запрос FC3 отвечает через delay секунд
+    (delay=None — не отвечает никогда). Считает записи, пришедшие от клиента.
+    """
+
+    def __init__(self, delay=0.05):
+        self.delay = delay
+        self.reads = 0
+        self.requests = 0
+        self.running = True
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.sock.bind(("127.0.0.1", 0))
+        self.sock.listen(4)
+        self.port = self.sock.getsockname()[1]
+        threading.Thread(target=self._serve, daemon=True).start()
+
+    def _serve(self):
+        try:
+            conn, _ = self.sock.accept()
+        except OSError:
+            return
+        with conn:
+            try:
+                self._loop(conn)
+            except OSError:
+                pass
+
+    def _loop(self, conn):
+        buffer = b""
+        replies = []   # (время ответа, порядковый номер, ответ)
+        while self.running:
+            timeout = 0.01
+            if replies:
+                timeout = max(0.0, min(timeout, replies[0][0] - time.time()))
+            readable, _, _ = select.select([conn], [], [], timeout)
+            if readable:
+                data = conn.recv(65536)
+                if not data:
+                    return
+                self.reads += 1
+                frames, buffer = ModbusTCPServer._split_frames(buffer + data)
+                for frame in frames:
+                    self.requests += 1
+                    if self.delay is None:
+                        continue
+                    transaction_id, _, _, unit_id = struct.unpack_from(">HHHB", frame)
+                    response = struct.pack(">HHHBBBH", transaction_id, 0, 5, unit_id, 3, 2, 0)
+                    heapq.heappush(replies, (time.time() + self.delay, self.requests, response))
+            now = time.time()
+            while replies and replies[0][0] <= now:
+                conn.sendall(heapq.heappop(replies)[2])
+
+    def close(self):
+        self.running = False
+        self.sock.close()
+
+
+def _run(server, duration, **kwargs):
+    """Прогнать клиента; ошибки снимаются до stop() — при остановке запросы в полёте считаются ошибками"""
+    worker = ModbusClientWorker(port=server.port, **kwargs)
+    worker.start()
+    try:
+        time.sleep(duration)
+        errors = worker.errors
+    finally:
+        worker.stop()
+        worker.thread.join(2.0)
+        server.close()
+    return worker, errors
+
+
+def test_window_limits_requests_in_flight_and_responses_return_credits():
+    # 500 пак/с при ответе через 50 мс — без окна в полёте было бы ~25 запросов
+    server = _DelayedServer(delay=0.05)
+    worker, errors = _run(server, 1.0, packets_per_second=500, pipeline_window=4)
+
+    assert worker.max_in_flight == 4
+    # Окно 4 при RTT 50 мс даёт ~80 ответов/с: кредиты возвращаются с ответами
+    assert worker.received_packets > 40
+    assert worker.window_stalls > 0
+    assert worker.timeouts == 0 and errors == 0
+    assert server.requests >= worker.received_packets
+
+
+def test_timeouts_return_credits():
+    server = _DelayedServer(delay=None)
+    worker, errors = _run(server, 1.0, packets_per_second=100, pipeline_window=2, response_timeout=0.2)
+
+    assert worker.received_packets == 0
+    assert worker.max_in_flight == 2
+    # Каждые ~0.2 с истекают 2 запроса и освобождают место для следующих
+    assert worker.timeouts >= 4
+    assert worker.sent_packets >= worker.timeouts + 1
+
+
+def test_full_window_counts_every_tick_as_a_stall():
+    server = _DelayedServer(delay=None)
+    worker, errors = _run(server, 1.0, packets_per_second=100, pipeline_window=4, response_timeout=5.0)
+
+    assert worker.sent_packets == 4
+    assert worker._due == 0
+    assert 85 <= worker.window_stalls <= 100
+
+
+def test_queued_requests_are_coalesced_into_one_write():
+    # 20000 пак/с: тик отправки (50 мкс) короче прохода цикла клиента,
+    # за проход копится несколько запросов
+    server = _DelayedServer(delay=0.001)
+    worker, errors = _run(server, 0.5, packets_per_second=20000, pipeline_window=64)
+
+    assert worker.coalesced_writes > 0
+    assert server.reads < server.requests
+    assert worker.max_in_flight <= 64
+    assert errors == 0
+
+
+def test_split_frames_multiple_and_partial():
+    first = struct.pack(">HHHBBHH", 1, 0, 6, 1, 3, 0, 1)
+    second = struct.pack(">HHHBBHHB", 2, 0, 11, 1, 16, 0, 2, 4) + b"\x00\x01\x00\x02"
+    third = struct.pack(">HHHBBHH", 3, 0, 6, 1, 3, 10, 2)
+    stream = first + second + third
+
+    assert ModbusTCPServer._split_frames(stream) == ([first, second, third], b"")
+
+    frames, rest = ModbusTCPServer._split_frames(stream[:-3])
+    assert frames == [first, second] and rest == third[:-3]
+
+    # Неполный заголовок и кадр, собранный из двух чтений
+    frames, rest = ModbusTCPServer._split_frames(first[:5])
+    assert frames == [] and rest == first[:5]
+    frames, rest = ModbusTCPServer._split_frames(rest + first[5:] + second[:9])
+    assert frames == [first] and rest == second[:9]
+    frames, rest = ModbusTCPServer._split_frames(rest + second[9:])
+    assert frames == [second] and rest == b""
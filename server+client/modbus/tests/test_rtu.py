@@ -0,0 +1,109 @@
+# tests/test_rtu.py
+import random
+import struct
+
+import pytest
+
+from modules.rtu_module import (
+    NEED_MORE, RTUDeframer, build_rtu_frame, crc16, crc16_batch, rtu_frame_length, validate_frames
+)
+
+
+READ_10 = bytes.fromhex("01030000000A")
+
+
+def _requests(count, seed=1):
+    rng = random.Random(seed)
+    frames = []
+    for _ in range(count):
+        if rng.random() < 0.7:
+            pdu = struct.pack(">BHH", rng.choice((1, 2, 3, 4, 5, 6)), rng.randint(0, 1000), rng.randint(1, 125))
+        else:
+            registers = rng.randint(1, 60)
+            pdu = struct.pack(">BHHB", 16, rng.randint(0, 1000), registers, registers * 2) \
+                + bytes(rng.getrandbits(8) for _ in range(registers * 2))
+        frames.append(build_rtu_frame(rng.randint(1, 247), pdu))
+    return frames
+
+
+def test_crc16_known_vector():
+    assert crc16(READ_10) == 0xCDC5
+    assert build_rtu_frame(1, READ_10[1:]) == READ_10 + b"\xC5\xCD"
+
+
+def test_crc16_is_incremental_and_zero_over_a_whole_frame():
+    frame = build_rtu_frame(1, READ_10[1:])
+    assert crc16(READ_10[3:], crc16(READ_10[:3])) == crc16(READ_10)
+    assert crc16(frame) == 0
+    assert crc16_batch([READ_10, frame]) == [0xCDC5, 0]
+
+
+def test_validate_frames_flags_corrupted_frames():
+    frames = _requests(20)
+    broken = bytearray(frames[5])
+    broken[2] ^= 0x01
+    frames[5] = bytes(broken)
+
+    assert validate_frames(frames) == [i != 5 for i in range(20)]
+
+
+def test_frame_length_needs_the_byte_count_for_variable_frames():
+    frame = build_rtu_frame(1, struct.pack(">BHHB", 16, 0, 2, 4) + b"\x00\x01\x00\x02")
+    assert rtu_frame_length(frame[:6]) == NEED_MORE
+    assert rtu_frame_length(frame[:7]) == len(frame)
+
+
+@pytest.mark.parametrize("chunk", [1, 3, 7, 64, 4096])
+def test_deframer_reassembles_frames_split_into_chunks(chunk):
+    frames = _requests(300)
+    stream = b"".join(frames)
+    deframer = RTUDeframer(request=True)
+
+    found = []
+    for offset in range(0, len(stream), chunk):
+        found.extend(deframer.feed(stream[offset:offset + chunk]))
+
+    assert found == frames
+    assert deframer.buffer == b""
+    assert deframer.crc_errors == 0 and deframer.resyncs == 0
+
+
+def test_deframer_splits_responses():
+    frames = [
+        build_rtu_frame(1, bytes([3, 4]) + b"\x00\x01\x00\x02"),
+        build_rtu_frame(2, struct.pack(">BHH", 6, 10, 0xBEEF)),
+        build_rtu_frame(3, bytes([0x83, 0x02])),
+        build_rtu_frame(4, struct.pack(">BHH", 16, 0, 8)),
+    ]
+    deframer = RTUDeframer(request=False)
+    found = []
+    for byte in b"".join(frames):
+        found.extend(deframer.feed(bytes([byte])))
+
+    assert found == frames
+
+
+def test_deframer_recovers_after_injected_garbage():
+    frames = _requests(50, seed=2)
+    garbage = [b"\xff", b"\x00\x00\x00", b"\x13\x37\xaa\x55\x99", b"\x01\x03\x00"]
+    rng = random.Random(3)
+
+    stream = b"\x00\xff\x42"
+    damaged = set()
+    for index, frame in enumerate(frames):
+        if index % 10 == 5:
+            stream += rng.choice(garbage)
+        if index % 10 == 8:
+            # Битый кадр: неверный CRC, должен быть пропущен
+            frame = frame[:-1] + bytes([frame[-1] ^ 0xFF])
+            damaged.add(index)
+        stream += frame
+
+    deframer = RTUDeframer(request=True)
+    found = []
+    for offset in range(0, len(stream), 5):
+        found.extend(deframer.feed(stream[offset:offset + 5]))
+
+    expected = [frame for index, frame in enumerate(frames) if index not in damaged]
+    assert found == expected
+    assert deframer.crc_errors + deframer.resyncs > 0
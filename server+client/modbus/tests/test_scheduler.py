@@ -0,0 +1,88 @@
+# tests/test_scheduler.py
+import random
+import threading
+
+from modules.scheduler import Timer, TimerWheel
+
+
+def _one_shot(wheel, deadline):
+    timer = Timer(deadline, 0, None, ())
+    wheel._insert(timer)
+    return timer
+
+
+def _check_exact(wheel, timers):
+    """Каждый таймер срабатывает ровно на своём тике — ни раньше, ни позже"""
+    by_deadline = {}
+    for timer in timers:
+        by_deadline.setdefault(timer.deadline, set()).add(id(timer))
+
+    for deadline in sorted(by_deadline):
+        assert wheel._advance(deadline - 1) == []
+        fired = wheel._advance(deadline)
+        assert {id(t) for t in fired} == by_deadline[deadline]
+        assert wheel._current == deadline
+
+
+def test_timers_fire_at_exact_tick_across_all_levels():
+    wheel = TimerWheel()
+    rng = random.Random(1)
+    # Все уровни колеса: 256 тиков, 16k, 1M и до 5M (за пределами последнего уровня)
+    deadlines = [rng.randint(1, limit) for limit in (255, 16_383, 1_048_575, 5_000_000) for _ in range(300)]
+    deadlines += [255, 256, 257, 16_383, 16_384, 1_048_576, 5_000_000]
+    timers = [_one_shot(wheel, deadline) for deadline in deadlines]
+
+    _check_exact(wheel, timers)
+    assert wheel.pending() == 0
+
+
+def test_timers_inserted_mid_run_fire_at_exact_tick():
+    wheel = TimerWheel()
+    rng = random.Random(2)
+    background = _one_shot(wheel, 10_000_000)
+
+    for advance_to in (1_000, 70_000, 1_500_000, 3_333_333):
+        assert wheel._advance(advance_to) == []
+        current = wheel._current
+        timers = [_one_shot(wheel, current + rng.randint(1, 1_600_000)) for _ in range(200)]
+        _check_exact(wheel, timers)
+
+    _check_exact(wheel, [background])
+
+
+def test_periodic_timer_keeps_its_phase():
+    wheel = TimerWheel()
+    timer = Timer(7, 300, None, ())
+    wheel._insert(timer)
+
+    fired_at = []
+    for _ in range(50):
+        expected = timer.deadline
+        assert wheel._advance(expected - 1) == []
+        assert wheel._advance(expected) == [timer]
+        fired_at.append(expected)
+    assert fired_at == [7 + 300 * k for k in range(50)]
+
+
+def test_cancelled_timer_does_not_fire():
+    wheel = TimerWheel()
+    kept = _one_shot(wheel, 20_000)
+    cancelled = _one_shot(wheel, 20_000)
+    cancelled.cancel()
+
+    assert wheel._advance(20_000) == [kept]
+
+
+def test_call_later_runs_callback_on_scheduler_thread():
+    wheel = TimerWheel()
+    wheel.start()
+    try:
+        done = threading.Event()
+        skipped = threading.Event()
+        wheel.call_later(0.02, done.set)
+        wheel.call_later(0.01, skipped.set).cancel()
+
+        assert done.wait(2.0)
+        assert not skipped.is_set()
+    finally:
+        wheel.stop()
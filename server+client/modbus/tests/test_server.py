@@ -0,0 +1,105 @@
+# tests/test_server.py
+import struct
+
+import pytest
+
+from modules.datastore_module import GatewayDataStore, HOLDING_REGISTERS, PAGE_SIZE
+from modules.rtu_module import build_rtu_frame, validate_frames
+from modules.server_module import (
+    GATEWAY_TARGET_FAILED, ILLEGAL_DATA_ADDRESS, ILLEGAL_DATA_VALUE, ILLEGAL_FUNCTION, ModbusTCPServer
+)
+
+
+@pytest.fixture
+def server():
+    store = GatewayDataStore()
+    store.add_units([1, 2])
+    return ModbusTCPServer(datastore=store)
+
+
+def _read(server, unit_id, function_code, address, count):
+    return server._process_pdu(unit_id, struct.pack(">BHH", function_code, address, count))
+
+
+def test_fc6_then_fc3_round_trip(server):
+    request = struct.pack(">BHH", 6, 10, 0xBEEF)
+    assert server._process_pdu(1, request) == request
+    assert _read(server, 1, 3, 9, 3) == bytes([3, 6]) + struct.pack(">3H", 0, 0xBEEF, 0)
+
+
+def test_fc16_then_fc3_round_trip_across_page_boundary(server):
+    address = PAGE_SIZE - 2
+    values = [1, 2, 3, 4, 5]
+    request = struct.pack(">BHHB", 16, address, len(values), len(values) * 2) + struct.pack(">5H", *values)
+
+    assert server._process_pdu(1, request) == request[:5]
+    assert _read(server, 1, 3, address, 5) == bytes([3, 10]) + struct.pack(">5H", *values)
+    assert server.datastore.get_unit(1).allocated_pages() == 2
+
+
+def test_fc5_then_fc1_round_trip(server):
+    on = struct.pack(">BHH", 5, 9, 0xFF00)
+    assert server._process_pdu(1, on) == on
+    assert _read(server, 1, 1, 8, 3) == bytes([1, 1, 0b010])
+
+    off = struct.pack(">BHH", 5, 9, 0x0000)
+    assert server._process_pdu(1, off) == off
+    assert _read(server, 1, 1, 8, 3) == bytes([1, 1, 0])
+
+
+def test_fc15_then_fc1_round_trip(server):
+    # 10 катушек начиная с 20: 1,0,1,1,0,0,0,0, 1,1
+    request = struct.pack(">BHHB", 15, 20, 10, 2) + bytes([0b00001101, 0b11])
+    assert server._process_pdu(1, request) == request[:5]
+    assert _read(server, 1, 1, 20, 10) == bytes([1, 2, 0b00001101, 0b11])
+
+
+def test_units_are_isolated(server):
+    server._process_pdu(1, struct.pack(">BHH", 6, 0, 42))
+    assert _read(server, 2, 3, 0, 1) == bytes([3, 2, 0, 0])
+
+
+def test_unknown_unit_gets_gateway_target_failed(server):
+    assert _read(server, 7, 3, 0, 1) == bytes([0x83, GATEWAY_TARGET_FAILED])
+    assert server._process_pdu(7, struct.pack(">BHH", 6, 0, 1)) == bytes([0x86, GATEWAY_TARGET_FAILED])
+
+
+def test_unit_base_offsets_unit_ids():
+    store = GatewayDataStore()
+    store.add_unit(1001)
+    server = ModbusTCPServer(datastore=store, unit_base=1000)
+
+    server._process_pdu(1, struct.pack(">BHH", 6, 0, 5))
+    assert store.get_unit(1001).get_values(HOLDING_REGISTERS, 0, 1) == [5]
+    assert _read(server, 2, 3, 0, 1) == bytes([0x83, GATEWAY_TARGET_FAILED])
+
+
+@pytest.mark.parametrize("pdu, code", [
+    (struct.pack(">BHH", 0x2B, 0, 1), ILLEGAL_FUNCTION),
+    (struct.pack(">BHH", 3, 0, 0), ILLEGAL_DATA_VALUE),
+    (struct.pack(">BHH", 3, 0, 126), ILLEGAL_DATA_VALUE),
+    (struct.pack(">BHH", 3, 0xFFFF, 2), ILLEGAL_DATA_ADDRESS),
+    (struct.pack(">BHH", 5, 0, 0x1234), ILLEGAL_DATA_VALUE),
+    (struct.pack(">BHHB", 16, 0, 2, 2) + b"\x00\x01", ILLEGAL_DATA_VALUE),
+])
+def test_exception_responses(server, pdu, code):
+    assert server._process_pdu(1, pdu) == bytes([pdu[0] | 0x80, code])
+
+
+def test_mbap_response_keeps_transaction_and_unit(server):
+    request = struct.pack(">HHHBBHH", 0x1234, 0, 6, 2, 3, 0, 2)
+    response = server._create_modbus_response(request)
+    assert response == struct.pack(">HHHBBB", 0x1234, 0, 7, 2, 3, 4) + b"\x00\x00\x00\x00"
+
+
+def test_rtu_response_and_broadcast(server):
+    response = server._create_rtu_response(build_rtu_frame(1, struct.pack(">BHH", 3, 0, 1)))
+    assert response == build_rtu_frame(1, bytes([3, 2, 0, 0]))
+    assert validate_frames([response]) == [True]
+
+    # unit 0 — широковещательная запись: выполняется без ответа
+    store = GatewayDataStore()
+    store.add_unit(0)
+    broadcast = ModbusTCPServer(datastore=store)
+    assert broadcast._create_rtu_response(build_rtu_frame(0, struct.pack(">BHH", 6, 3, 9))) == b""
+    assert store.get_unit(0).get_values(HOLDING_REGISTERS, 3, 1) == [9]
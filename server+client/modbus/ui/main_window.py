@@ -1,7 +1,7 @@
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
     QTableWidget, QTableWidgetItem, QTabWidget, QPlainTextEdit,
-    QSpinBox, QComboBox
+    QSpinBox, QComboBox, QFileDialog
 )
 from PyQt6.QtCore import QTimer
 import pyqtgraph as pg
@@ -9,7 +9,8 @@ import time
 
 # --- Модули приложения ---
 from modules.broker import ServerDataBroker
-from modules.server_module import ModbusTCPServer
+from modules.backend_module import get_backend
+from modules.datastore_module import GatewayDataStore
 from modules.client_manager import ClientManager
 from modules.proxy_module import ProxyManager
 from modules.attacks_module import AttackManager
@@ -17,19 +18,30 @@ from modules.logger_module import Logger
 
 
 class ModbusGUI(QWidget):
-    def __init__(self):
+    def __init__(self, backend="native", framing="mbap", transport="tcp", units=1):
         super().__init__()
-        self.setWindowTitle("Modbus Server & Client Simulator")
+        self.backend = get_backend(backend)
+        self.setWindowTitle(f"Modbus Server & Client Simulator [{self.backend.name}]")
         self.resize(1100, 700)
 
         # Источник данных
         self.data_broker = ServerDataBroker(history_seconds=300)
 
+        # Шлюз: юниты 1..units с общим шаблоном адресного пространства
+        unit_ids = range(1, units + 1)
+        self.datastore = GatewayDataStore()
+        self.datastore.add_units(unit_ids)
+
         # Сервер
-        self.server = ModbusTCPServer(data_broker=self.data_broker)
+        self.server = self.backend.create_server(
+            data_broker=self.data_broker, framing=framing, transport=transport, datastore=self.datastore
+        )
 
         # Клиенты
-        self.client_manager = ClientManager()
+        self.client_manager = ClientManager(
+            backend=self.backend, framing=framing, transport=transport, serial_port=self.server.serial_port,
+            unit_ids=unit_ids
+        )
 
         # Прокси
         self.proxy_manager = ProxyManager(self.server)
@@ -129,9 +141,11 @@ class ModbusGUI(QWidget):
         layout.addLayout(control)
 
         self.client_table = QTableWidget()
-        self.client_table.setColumnCount(4)
+        self.client_table.setColumnCount(12)
         self.client_table.setHorizontalHeaderLabels([
-            "Клиент", "Отправлено пакетов", "Всего отправлено", "Пакетов/сек"
+            "Клиент", "Состояние", "Отправлено пакетов", "Всего отправлено",
+            "Подключение, мс", "Сбоев подключения", "Переподключений",
+            "В полёте (макс)", "Простоев окна", "Окно", "Churn, с", "Пакетов/сек"
         ])
         self.client_table.horizontalHeader().setStretchLastSection(True)
         layout.addWidget(self.client_table)
@@ -193,6 +207,17 @@ class ModbusGUI(QWidget):
         self.start_attack_btn.clicked.connect(self._start_attack)
         control.addWidget(self.start_attack_btn)
 
+        self.campaign_btn = QPushButton("Загрузить сценарий")
+        self.campaign_btn.clicked.connect(self._load_campaign)
+        control.addWidget(self.campaign_btn)
+
+        self.campaign_select = QComboBox()
+        control.addWidget(self.campaign_select)
+
+        self.stop_campaign_btn = QPushButton("Остановить сценарий")
+        self.stop_campaign_btn.clicked.connect(self._stop_campaign)
+        control.addWidget(self.stop_campaign_btn)
+
         layout.addLayout(control)
 
         self.attack_table = QTableWidget()
@@ -212,6 +237,29 @@ class ModbusGUI(QWidget):
         self.attack_manager.start_attack_for_client(client_index, attack_type)
         self._update_attacks_table()
 
+    def _load_campaign(self):
+        path, _ = QFileDialog.getOpenFileName(self, "Сценарий атак", "", "JSON (*.json)")
+        if not path:
+            return
+        try:
+            self.attack_manager.run_campaign(path)
+            self.live_log.appendPlainText(f"[CAMPAIGN] Сценарий запущен: {path}")
+            self.logger.log(f"[CAMPAIGN] Started campaign: {path}")
+        except Exception as e:
+            self.live_log.appendPlainText(f"[ERROR] Не удалось загрузить сценарий: {e}")
+        self._update_attacks_table()
+
+    def _stop_campaign(self):
+        """Остановка выбранного сценария: будущие шаги отменяются, его атаки останавливаются"""
+        campaign_id = self.campaign_select.currentData()
+        if campaign_id is None:
+            self.live_log.appendPlainText("[CAMPAIGN] Нет активных сценариев")
+            return
+        if self.attack_manager.stop_campaign(campaign_id):
+            self.live_log.appendPlainText(f"[CAMPAIGN] Сценарий #{campaign_id} остановлен")
+            self.logger.log(f"[CAMPAIGN] Stopped campaign #{campaign_id}")
+        self._update_attacks_table()
+
     def _stop_attack(self, attack_id=None, _=None):
         """
         Остановка атаки.
@@ -222,8 +270,9 @@ class ModbusGUI(QWidget):
         if attack_id is None:
             selected_row = self.attack_table.currentRow()
             if selected_row < 0:
-                # Если нет выбора, остановить все атаки
-                stopped_any = False
+                # Если нет выбора, остановить все атаки и сценарии,
+                # иначе оставшиеся шаги сценариев запустят новые атаки
+                stopped_any = self.attack_manager.stop_all_campaigns()
                 for aid in list(self.attack_manager.active_attacks.keys()):
                     stopped = self.attack_manager.stop_attack(aid)
                     stopped_any = stopped_any or stopped
@@ -288,6 +337,10 @@ class ModbusGUI(QWidget):
         default_rate = 10
         if self.client_manager.add_client(default_rate):
             self.live_log.appendPlainText(f"[CLIENT] Клиент добавлен (скорость {default_rate} пак/с)")
+        elif self.client_manager.transport == "pty":
+            self.live_log.appendPlainText("[CLIENT] На последовательном порту допускается только один мастер")
+        else:
+            self.live_log.appendPlainText(f"[CLIENT] Достигнут предел клиентов ({self.client_manager.max_clients})")
         self._update_client_table()
 
     def _remove_client(self):
@@ -300,7 +353,11 @@ class ModbusGUI(QWidget):
     # ------------------------------------------------------------
     def _update_client_table(self):
         clients = self.client_manager.clients
-        self.active_clients_label.setText(f"Активных клиентов: {len(clients)}")
+        stats = self.client_manager.get_connection_stats()
+        self.active_clients_label.setText(
+            f"Активных клиентов: {stats['connected']} / {len(clients)} "
+            f"(сбоев подключения: {stats['connect_failures']})"
+        )
         self.client_table.setRowCount(len(clients))
 
         # --- Обновляем список клиентов только если изменилось количество ---
@@ -311,14 +368,36 @@ class ModbusGUI(QWidget):
 
         for idx, c in enumerate(clients):
             self.client_table.setItem(idx, 0, QTableWidgetItem(f"Client {idx + 1}"))
-            self.client_table.setItem(idx, 1, QTableWidgetItem(str(c.sent_packets)))
-            self.client_table.setItem(idx, 2, QTableWidgetItem(str(c.total_sent_packets)))
+            self.client_table.setItem(idx, 1, QTableWidgetItem(c.state))
+            self.client_table.setItem(idx, 2, QTableWidgetItem(str(c.sent_packets)))
+            self.client_table.setItem(idx, 3, QTableWidgetItem(str(c.total_sent_packets)))
+
+            latency = c.avg_connect_latency
+            self.client_table.setItem(idx, 4, QTableWidgetItem(f"{latency * 1000:.2f}" if latency is not None else "-"))
+            self.client_table.setItem(idx, 5, QTableWidgetItem(str(c.connect_failures)))
+            self.client_table.setItem(idx, 6, QTableWidgetItem(str(c.disconnects)))
+            self.client_table.setItem(idx, 7, QTableWidgetItem(f"{c.in_flight} ({c.max_in_flight})"))
+            self.client_table.setItem(idx, 8, QTableWidgetItem(str(c.window_stalls)))
+
+            # 0 — pipelining выключен
+            window_spin = QSpinBox()
+            window_spin.setRange(0, 1000)
+            window_spin.setValue(c.pipeline_window or 0)
+            window_spin.valueChanged.connect(lambda val, client=c: client.set_pipeline(val))
+            self.client_table.setCellWidget(idx, 9, window_spin)
+
+            # 0 — churn выключен, иначе переподключение каждые N секунд
+            churn_spin = QSpinBox()
+            churn_spin.setRange(0, 3600)
+            churn_spin.setValue(int(c.churn_interval or 0))
+            churn_spin.valueChanged.connect(lambda val, client=c: client.set_churn(val))
+            self.client_table.setCellWidget(idx, 10, churn_spin)
 
             spin = QSpinBox()
             spin.setRange(1, 2000)
             spin.setValue(int(c.packets_per_second))
             spin.valueChanged.connect(lambda val, client=c: client.update_rate(val))
-            self.client_table.setCellWidget(idx, 3, spin)
+            self.client_table.setCellWidget(idx, 11, spin)
 
     def _update_attacks_table(self):
         attacks = self.attack_manager.list_attacks()
@@ -333,6 +412,14 @@ class ModbusGUI(QWidget):
             btn_stop.clicked.connect(lambda _, a_id=attack_id: self._stop_attack(a_id))
             self.attack_table.setCellWidget(row, 3, btn_stop)
 
+        # Список сценариев: пересобирается только при изменении набора
+        campaigns = self.attack_manager.list_campaigns()
+        ids = [c["id"] for c in campaigns]
+        if ids != [self.campaign_select.itemData(i) for i in range(self.campaign_select.count())]:
+            self.campaign_select.clear()
+            for campaign in campaigns:
+                self.campaign_select.addItem(f"#{campaign['id']} {campaign['name']}", campaign["id"])
+
     def _update_logs(self):
         try:
             logs = self.logger.read_logs()